@@ -1,24 +1,354 @@
 import requests
 import os
+import json
+import time
+import random
+import logging
+import threading
+from collections import Counter, deque
+from email.utils import parsedate_to_datetime
+from typing import Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from response_cache import ResponseCache
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens per second and
+    holding at most `capacity`. acquire() blocks until a token is free,
+    so every thread sharing the bucket stays within one request rate.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is free, without waiting."""
+        with self._lock:
+            self._refill()
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on requests in flight, shared by every thread using the
+    client. Each success adds 1/limit, about one slot per round of
+    requests. A throttled or failed request halves the limit; latency
+    alone never lowers it, since ordinary jitter would drive it to the
+    minimum. Decreases happen at most once per average round trip, so
+    one burst of errors counts once. pause() holds every request back
+    until a Retry-After has passed.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.avg_latency = None
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                else:
+                    self._condition.wait()
+
+    def release(self, latency: Optional[float] = None, congested: bool = False):
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if congested:
+                self._decrease(now, 0.5)
+            elif latency is not None:
+                self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+    def _decrease(self, now: float, factor: float):
+        if now - self._last_decrease < (self.avg_latency or 0):
+            return
+        self.limit = max(self.min_limit, self.limit * factor)
+        self._last_decrease = now
+
+    def pause(self, seconds: float):
+        with self._condition:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
 class OpenLibraryClient:
     BASE_URL = os.getenv("Base_URL")
-    if not BASE_URL:
-        raise ValueError("BASE_URL is not set in environment variables.")
 
-    def __init__(self, rate_limit_delay: float = 1.0):
+    # Latencies kept for latency_percentile(); older samples are dropped
+    LATENCY_SAMPLES = 10_000
+
+    # Worth retrying; 429 and 503 also mean "slow down"
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    THROTTLE_STATUSES = frozenset({429, 503})
+
+    # Only what book rows need, so search pages stay small
+    SEARCH_FIELDS = "key,title,isbn,first_publish_year"
+    SEARCH_PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        rate_limit_delay: float = 1.0,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        compression: bool = True,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+        base_url: Optional[str] = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        adaptive: bool = True
+    ):
+        self.base_url = base_url or self.BASE_URL
+        if not self.base_url:
+            raise ValueError("BASE_URL is not set in environment variables.")
+        if offline and cache is None:
+            raise ValueError("Offline mode needs a response cache.")
+
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self._closed_pool_stats = None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Keeps requests in flight below pool_size when the server pushes back
+        self.scheduler = AdaptiveConcurrency(pool_size) if adaptive else None
+        self.request_stats = Counter()
+        self._stats_lock = threading.Lock()
         self.delay = rate_limit_delay
+        self.cache = cache
+        self.offline = offline
+        self.timeout = (connect_timeout, read_timeout)
+        # One request per `rate_limit_delay` seconds across all threads
+        self.bucket = TokenBucket(1 / rate_limit_delay) if rate_limit_delay > 0 else None
+
+        # One keep-alive session so calls reuse pooled connections instead
+        # of opening a new TCP/TLS connection each time
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate" if compression else "identity"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Closing the session drops its pools and their counters
+        self._closed_pool_stats = self.pool_stats()
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def pool_stats(self) -> dict:
+        """Requests sent and connections opened across the session's pools."""
+        if self._closed_pool_stats is not None:
+            return self._closed_pool_stats
+
+        requests_sent = connections = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+
+        return {
+            "requests": requests_sent,
+            "connections_opened": connections,
+            "connections_reused": requests_sent - connections
+        }
+
+    def scheduler_stats(self) -> dict:
+        """Throttled responses, retries and requests given up on, plus the current concurrency limit."""
+        with self._stats_lock:
+            stats = {name: self.request_stats[name] for name in ("throttled", "retried", "failed")}
+        stats["concurrency_limit"] = int(self.scheduler.limit) if self.scheduler is not None else None
+        return stats
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.request_stats[name] += 1
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            # Everyone waits out Retry-After in the scheduler; jitter spreads the restart
+            return random.uniform(0, self.backoff_base)
+        # Full jitter: anywhere up to the exponential step
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _send(self, url: str, headers: dict):
+        """
+        GET `url`, retrying transient failures (429, 5xx and any
+        requests error: connection failures, timeouts, broken bodies)
+        up to max_retries times with jittered exponential backoff, or
+        after Retry-After when the server sends one. Returns the
+        response, or None once retries are exhausted.
+        """
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retried")
+
+            if self.scheduler is not None:
+                self.scheduler.acquire()
+            if self.bucket is not None:
+                self.bucket.acquire()
+
+            retry_after = None
+            latency, congested = None, False
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                congested = True
+                problem = e.__class__.__name__
+            else:
+                latency = time.perf_counter() - started
+                self.latencies.append(latency)
+
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+
+                congested = True
+                if response.status_code in self.THROTTLE_STATUSES:
+                    self._count("throttled")
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None and self.scheduler is not None:
+                        self.scheduler.pause(retry_after)
+                problem = f"HTTP {response.status_code}"
+            finally:
+                # Whatever happened, the slot must come back
+                if self.scheduler is not None:
+                    self.scheduler.release(latency, congested)
+
+            if attempt == self.max_retries:
+                break
+
+            delay = self._backoff(attempt, retry_after)
+            if retry_after is not None and self.scheduler is None:
+                delay += retry_after
+            logger.debug(f"{url}: {problem}, retrying in {delay:.2f}s.")
+            time.sleep(delay)
+
+        self._count("failed")
+        logger.warning(f"Giving up on {url} after {self.max_retries + 1} attempts ({problem}).")
+        return None
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Seconds within which `percentile`% of recent HTTP requests completed."""
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
 
     def _get(self, endpoint: str):
-        url = f"{self.BASE_URL}{endpoint}"
-        response = requests.get(url)
+        url = f"{self.base_url}{endpoint}"
+
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            self.cache.stats["hits"] += 1
+            return json.loads(entry.body)
+
+        if self.offline:
+            self.cache.stats["offline_misses"] += 1
+            return None
+
+        # Revalidate a stale entry instead of downloading it again
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = self._send(url, headers)
+        if response is None:
+            return None
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            self.cache.stats["revalidated"] += 1
+            return json.loads(entry.body)
 
         if response.status_code != 200:
             return None
 
+        if self.cache is not None:
+            self.cache.put(
+                url,
+                response.text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified")
+            )
+            self.cache.stats["misses"] += 1
+
         return response.json()
 
     def search_author(self, author_name: str):
@@ -39,6 +369,28 @@ class OpenLibraryClient:
 
         return data.get("entries", [])
 
+    def search_author_works(self, author_key: str, page_size: int = SEARCH_PAGE_SIZE):
+        """
+        Yield the author's works from /search.json, `page_size` per
+        request. Each doc carries its editions' ISBNs and first publish
+        year. Pages are fetched lazily, so stopping early saves requests.
+        """
+        page = 1
+        while True:
+            data = self._get(
+                f"/search.json?author_key={author_key}&fields={self.SEARCH_FIELDS}"
+                f"&limit={page_size}&page={page}"
+            )
+            if not data:
+                return
+
+            docs = data.get("docs", [])
+            yield from docs
+
+            if len(docs) < page_size or page * page_size >= data.get("numFound", 0):
+                return
+            page += 1
+
     def get_work_editions(self, work_id: str):
         data = self._get(f"/works/{work_id}/editions.json")
         if not data:
@@ -64,3 +416,27 @@ class OpenLibraryClient:
                 return isbn, publish_date
 
         return None, None
+
+    @staticmethod
+    def search_edition_data(doc: dict):
+        """(isbn, publish_date) from a search doc, preferring an ISBN-13."""
+        isbns = doc.get("isbn") or []
+        isbn = next((i for i in isbns if len(i) == 13), isbns[0] if isbns else None)
+
+        year = doc.get("first_publish_year")
+        publish_date = str(year) if year else None
+
+        if isbn and publish_date:
+            return isbn, publish_date
+        return None, None
+
+    def get_work_edition_data(self, work: dict, work_id: str):
+        """
+        Edition data for a work, read from the work itself when it came
+        from search_author_works; otherwise its editions are fetched.
+        """
+        isbn, publish_date = self.search_edition_data(work)
+        if isbn and publish_date:
+            return isbn, publish_date
+
+        return self.get_valid_edition_data(work_id)
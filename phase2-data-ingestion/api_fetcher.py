@@ -1,14 +1,23 @@
-import time
+import os
+import json
 import argparse
+import asyncio
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
 
 from models import Book
-from schemas import BookSchema
+from schemas import BookSchema, normalize_name
 from api_client import OpenLibraryClient
+from db_utils import insert_ignore
+from response_cache import ResponseCache
 
 
 # ---------------------------
@@ -23,70 +32,341 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def parse_arguments():
+def parse_arguments(argv=None):
     parser = argparse.ArgumentParser(
         description="Fetch books from OpenLibrary and insert into database."
     )
 
-    parser.add_argument(
+    authors = parser.add_mutually_exclusive_group(required=True)
+
+    authors.add_argument(
         "--author",
-        required=True,
         help="Author name (e.g. 'Charles Dickens')"
     )
 
+    authors.add_argument(
+        "--authors-file",
+        help="File with one author name per line; blank lines and # comments are skipped"
+    )
+
     parser.add_argument(
         "--limit",
         type=int,
         required=True,
-        help="Number of valid books to fetch"
+        help="Number of valid books to fetch per author"
     )
 
     parser.add_argument(
         "--db",
-        required=True,
-        help="Database connection URL"
+        help="Database connection URL; with --output-jsonl only used to skip catalogued works"
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--output-jsonl",
+        default=None,
+        help="Append validated books to this JSONL file as they are found instead of "
+             "inserting them; load it later with jsonl_loader.py"
+    )
 
+    parser.add_argument(
+        "--strategy",
+        choices=("editions", "search"),
+        default="editions",
+        help="editions: list the author's works, then fetch each work's editions. "
+             "search: page through /search.json, which returns ISBNs and publish years "
+             "with the works, and fetch editions only for works without them (default: editions)"
+    )
 
-def main():
-    args = parse_arguments()
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="OpenLibrary base URL (default: Base_URL from the environment)"
+    )
 
-    author_name = args.author
-    limit = args.limit
-    database_url = args.db
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Edition requests kept in flight; above 1 fetches with asyncio (default: 1)"
+    )
 
-    logger.info("Starting book fetch process.")
-    logger.info(f"Author: {author_name}, Limit: {limit}")
+    parser.add_argument(
+        "--author-workers",
+        type=int,
+        default=4,
+        help="Authors fetched at the same time with --authors-file (default: 4)"
+    )
 
-    try:
-        engine = create_engine(database_url)
-        SessionLocal = sessionmaker(bind=engine)
-        session = SessionLocal()
-        logger.info("Database connection established.")
-    except Exception as e:
-        logger.error(f"Database connection failed: {e}")
-        return
+    parser.add_argument(
+        "--rate-limit-delay",
+        type=float,
+        default=1.0,
+        help="Seconds between OpenLibrary requests, shared by all in-flight requests (default: 1)"
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Maximum pooled HTTP connections to OpenLibrary (default: 10)"
+    )
+
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=5.0,
+        help="Seconds to wait for an HTTP connection (default: 5)"
+    )
+
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for an HTTP response (default: 30)"
+    )
+
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=4,
+        help="Retries for throttled (429/503), 5xx or failed requests, with jittered "
+             "exponential backoff or the server's Retry-After (default: 4)"
+    )
+
+    parser.add_argument(
+        "--no-adaptive",
+        action="store_true",
+        help="Keep --pool-size requests in flight instead of adapting concurrency to "
+             "throttling and latency"
+    )
+
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Ask OpenLibrary for uncompressed responses"
+    )
+
+    parser.add_argument(
+        "--cache-path",
+        default=".openlibrary_cache.sqlite3",
+        help="SQLite file caching OpenLibrary responses (default: .openlibrary_cache.sqlite3)"
+    )
 
-    client = OpenLibraryClient()
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=86400,
+        help="Seconds a cached response is served before revalidation (default: 86400)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch from OpenLibrary"
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve responses only from the cache; never call OpenLibrary"
+    )
+
+    args = parser.parse_args(argv)
+    if not args.db and not args.output_jsonl:
+        parser.error("--db is required unless --output-jsonl is given")
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the response cache; drop --no-cache")
 
-    logger.info("Searching author...")
-    author_key = client.search_author(author_name)
+    return args
 
-    if not author_key:
-        logger.warning("Author not found.")
-        return
 
-    logger.info(f"Author key found: {author_key}")
-    logger.info("Fetching works...")
+def log_pool_stats(client: OpenLibraryClient):
+    stats = client.pool_stats()
+    logger.info(
+        f"HTTP pool: {stats['requests']} requests, "
+        f"{stats['connections_opened']} connections opened, "
+        f"{stats['connections_reused']} reused."
+    )
 
-    works = client.get_author_works(author_key)
-    books = []
+    stats = client.scheduler_stats()
+    logger.info(
+        f"Scheduler: {stats['throttled']} throttled, {stats['retried']} retried, "
+        f"{stats['failed']} given up, concurrency limit {stats['concurrency_limit']}."
+    )
 
+    p95 = client.latency_percentile(95)
+    if p95 is not None:
+        logger.info(f"HTTP latency: p50 {client.latency_percentile(50) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms.")
+
+    if client.cache is not None:
+        stats = client.cache.stats
+        logger.info(
+            f"Response cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} fetched, {stats['offline_misses']} missing offline."
+        )
+
+
+def read_authors_file(path: str) -> list:
+    """Author names from `path`, in order, without blanks, comments or repeats."""
+    authors = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            name = line.strip()
+            if name and not name.startswith("#") and name not in authors:
+                authors.append(name)
+
+    return authors
+
+
+class WorkClaims:
+    """
+    Work ids already taken by some author in this run. Co-authored works
+    are listed under every author; only the first author to reach one
+    fetches its editions.
+    """
+
+    def __init__(self):
+        self._claimed = set()
+        self._lock = threading.Lock()
+
+    def claim(self, work_id: str) -> bool:
+        with self._lock:
+            if work_id in self._claimed:
+                return False
+            self._claimed.add(work_id)
+            return True
+
+    def release(self, work_id: str):
+        """Hand back a claimed work whose editions were never used."""
+        with self._lock:
+            self._claimed.discard(work_id)
+
+
+class Catalogue:
+    """
+    ISBNs and normalized titles already in `book`, loaded once per run.
+    Works matching one are skipped before any editions call, and ISBNs
+    collected during the run are added so no two works yield the same one.
+    """
+
+    def __init__(self, isbns=(), titles=()):
+        self.isbns = set(isbns)
+        self.titles = set(titles)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, session) -> "Catalogue":
+        rows = session.execute(select(Book.isbn, Book.title)).all()
+        return cls((isbn for isbn, _ in rows), (title for _, title in rows))
+
+    def add_jsonl(self, path: str):
+        """Also treat books already harvested into a JSONL file as catalogued."""
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+
+                try:
+                    record = json.loads(line)
+                    isbn, title = record["isbn"], record["title"]
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    # Cut short by a run that was killed mid-write, or not a book record
+                    logger.warning(f"{path}:{line_number}: skipped ({e.__class__.__name__}).")
+                    continue
+
+                self.isbns.add(isbn)
+                self.titles.add(title)
+
+    def has_title(self, title: str) -> bool:
+        return normalize_name(title) in self.titles
+
+    def claim_isbn(self, isbn: str) -> bool:
+        with self._lock:
+            if isbn in self.isbns:
+                return False
+            self.isbns.add(isbn)
+            return True
+
+
+class JsonlSink:
+    """
+    Append-only JSONL file of validated book records, one per line.
+    Each record is flushed as it is written, so a failed run keeps
+    every book it found and loading can be retried without refetching.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.written = 0
+        self._file = open(path, "a+", encoding="utf-8")
+        self._lock = threading.Lock()
+
+        # Start on a fresh line after a record cut short by a killed run
+        if self._file.tell() > 0:
+            self._file.seek(self._file.tell() - 1)
+            if self._file.read(1) != "\n":
+                self._file.write("\n")
+
+    def write(self, book_data: dict) -> bool:
+        try:
+            record = BookSchema(**book_data).model_dump(mode="json", exclude={"book_id"})
+        except Exception as e:
+            logger.error(f"Validation failed for {book_data['title']}:\n{e}")
+            return False
+
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.written += 1
+        return True
+
+    def close(self):
+        self._file.close()
+
+
+@dataclass
+class AuthorYield:
+    author: str
+    author_key: Optional[str] = None
+    works: int = 0
+    catalogued: int = 0
+    books: list = field(default_factory=list)
+    # Rows inserted, or records written with --output-jsonl
+    inserted: int = 0
+    sink: Optional[JsonlSink] = field(default=None, repr=False)
+
+    @property
+    def found(self) -> int:
+        """Books the author has in the catalogue, counting those from earlier runs."""
+        return self.catalogued + len(self.books)
+
+    def add_book(self, book_data: dict):
+        if self.sink is not None:
+            if not self.sink.write(book_data):
+                return
+            self.inserted += 1
+
+        self.books.append(book_data)
+        logger.debug(f"Added valid book: {book_data['title']}")
+
+
+def candidate_works(
+    works,
+    result: AuthorYield,
+    limit: int,
+    claims: Optional[WorkClaims] = None,
+    catalogue: Optional[Catalogue] = None
+):
+    """
+    Yield (title, work_id, work) for works that have both, are not
+    claimed yet and are not catalogued already, until the author has
+    `limit` books. Catalogued works count towards `limit` without a request.
+    """
     for work in works:
-        if len(books) >= limit:
-            break
+        if result.found >= limit:
+            return
+        result.works += 1
 
         work_key = work.get("key")
         title = work.get("title")
@@ -94,59 +374,300 @@ def main():
         if not work_key or not title:
             continue
 
-        work_id = work_key.split("/")[-1]
-        logger.info(f"Checking work: {title}")
+        if catalogue is not None and catalogue.has_title(title):
+            logger.debug(f"Skipping work already catalogued: {title}")
+            result.catalogued += 1
+            continue
 
-        isbn, publish_date = client.get_valid_edition_data(work_id)
-        time.sleep(1)
+        work_id = work_key.split("/")[-1]
+        if claims is not None and not claims.claim(work_id):
+            logger.debug(f"Skipping work already fetched for another author: {title}")
+            continue
 
-        if isbn and publish_date:
-            books.append({
-                "title": title,
-                "isbn": isbn,
-                "publication_date": publish_date,
-                "total_copies": 5,
-                "available_copies": 5,
-                "library_id": 6
-            })
-            logger.info(f"Added valid book: {title}")
+        yield title, work_id, work
+
+
+def book_row(title: str, isbn: str, publish_date: str) -> dict:
+    return {
+        "title": title,
+        "isbn": isbn,
+        "publication_date": publish_date,
+        "total_copies": 5,
+        "available_copies": 5,
+        "library_id": 6
+    }
+
+
+def is_new_book(isbn, publish_date, catalogue: Optional[Catalogue]) -> bool:
+    if not isbn or not publish_date:
+        return False
+    return catalogue is None or catalogue.claim_isbn(isbn)
+
+
+def collect_books(
+    client: OpenLibraryClient,
+    works,
+    limit: int,
+    result: AuthorYield,
+    claims: Optional[WorkClaims] = None,
+    catalogue: Optional[Catalogue] = None
+):
+    for title, work_id, work in candidate_works(works, result, limit, claims, catalogue):
+        logger.debug(f"Checking work: {title}")
+        isbn, publish_date = client.get_work_edition_data(work, work_id)
+
+        if is_new_book(isbn, publish_date, catalogue):
+            result.add_book(book_row(title, isbn, publish_date))
+
+
+async def collect_books_async(
+    client: OpenLibraryClient,
+    works,
+    limit: int,
+    result: AuthorYield,
+    concurrency: int,
+    claims: Optional[WorkClaims] = None,
+    catalogue: Optional[Catalogue] = None
+):
+    """
+    Keep up to `concurrency` edition requests in flight, consuming them
+    in work order so the same books are picked as by collect_books.
+    Nothing new is scheduled once the author has `limit` books.
+    """
+    loop = asyncio.get_running_loop()
+    candidates = candidate_works(works, result, limit, claims, catalogue)
+    in_flight = deque()
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    def schedule():
+        for title, work_id, work in candidates:
+            logger.debug(f"Checking work: {title}")
+            future = loop.run_in_executor(executor, client.get_work_edition_data, work, work_id)
+            in_flight.append((title, work_id, future))
+            return
 
-    if len(books) < limit:
-        logger.warning(f"Couldn't find {limit} book(s) with valid entries.")
+    try:
+        for _ in range(concurrency):
+            schedule()
 
-    logger.info(f"Total Valid Books Collected: {len(books)}")
-    logger.info("Inserting books into database...")
+        while in_flight and result.found < limit:
+            title, work_id, future = in_flight[0]
+            isbn, publish_date = await future
+            in_flight.popleft()
 
-    for book_data in books:
-        try:
-            validated_book = BookSchema(**book_data)
+            if is_new_book(isbn, publish_date, catalogue):
+                result.add_book(book_row(title, isbn, publish_date))
 
-            db_book = Book(
-                title=validated_book.title,
-                isbn=validated_book.isbn,
-                publication_date=validated_book.publication_date,
-                total_copies=validated_book.total_copies,
-                available_copies=validated_book.available_copies,
-                library_id=validated_book.library_id
-            )
+            if result.found < limit:
+                schedule()
 
-            session.add(db_book)
+    finally:
+        # Requests already sent finish in the background, retries
+        # included, and their results are dropped; the author does not
+        # wait for them. Their works go back to co-authors.
+        for _, work_id, future in in_flight:
+            future.cancel()
+            if claims is not None:
+                claims.release(work_id)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_author(
+    client: OpenLibraryClient,
+    author_name: str,
+    args,
+    claims: Optional[WorkClaims] = None,
+    catalogue: Optional[Catalogue] = None,
+    sink: Optional[JsonlSink] = None
+) -> AuthorYield:
+    result = AuthorYield(author_name, sink=sink)
+
+    logger.info(f"Searching author: {author_name}")
+    result.author_key = client.search_author(author_name)
+
+    if not result.author_key:
+        logger.warning(f"Author not found: {author_name}")
+        return result
+
+    logger.info(f"Author key found: {result.author_key}")
+    logger.info(f"Fetching works for {author_name}...")
+
+    if args.strategy == "search":
+        works = client.search_author_works(result.author_key)
+    else:
+        works = client.get_author_works(result.author_key)
+
+    if args.concurrency > 1:
+        asyncio.run(collect_books_async(client, works, args.limit, result, args.concurrency, claims, catalogue))
+    else:
+        collect_books(client, works, args.limit, result, claims, catalogue)
+
+    if result.found < args.limit:
+        logger.warning(f"Couldn't find {args.limit} book(s) with valid entries for {author_name}.")
+
+    return result
+
+
+def fetch_authors(
+    client: OpenLibraryClient,
+    authors: list,
+    args,
+    catalogue: Optional[Catalogue] = None,
+    sink: Optional[JsonlSink] = None
+) -> list:
+    """
+    Fetch every author over the shared client, `author_workers` at a
+    time. The client's token bucket keeps the combined request rate at
+    --rate-limit-delay however many authors are in flight.
+    """
+    claims = WorkClaims()
+
+    if args.author_workers <= 1 or len(authors) == 1:
+        return [fetch_author(client, author, args, claims, catalogue, sink) for author in authors]
+
+    with ThreadPoolExecutor(max_workers=args.author_workers) as executor:
+        return list(executor.map(lambda author: fetch_author(client, author, args, claims, catalogue, sink), authors))
+
+
+def insert_books(session, books: list) -> int:
+    """
+    Validate one author's books and insert them in a single batched
+    INSERT ... ON CONFLICT DO NOTHING, so a duplicate ISBN skips only
+    that row. Returns the rows inserted.
+    """
+    rows = []
 
+    for book_data in books:
+        try:
+            rows.append(BookSchema(**book_data).model_dump(exclude={"book_id"}))
         except Exception as e:
             logger.error(f"Validation failed for {book_data['title']}:\n{e}")
 
+    if not rows:
+        return 0
+
+    statement = insert_ignore(session.get_bind(), Book).returning(Book.isbn)
+
     try:
+        inserted = len(session.execute(statement, rows).all())
         session.commit()
-        logger.info("Books inserted successfully.")
     except IntegrityError as e:
         session.rollback()
-        logger.error("Database integrity error (possibly duplicate ISBN).")
+        logger.error("Database integrity error while inserting books.")
         logger.error(f"\n{e}")
+        return 0
+
+    if inserted < len(rows):
+        logger.info(f"Skipped {len(rows) - inserted} book(s) already in the database.")
+    return inserted
+
+
+def log_author_yields(results: list, limit: int, saved: str = "inserted"):
+    logger.info("Per-author yield:")
+    for result in results:
+        if not result.author_key:
+            logger.info(f"  {result.author}: author not found")
+            continue
+
+        logger.info(
+            f"  {result.author} ({result.author_key}): {result.works} works checked, "
+            f"{result.catalogued} already catalogued, {len(result.books)} new valid books "
+            f"({result.found}/{limit}), {result.inserted} {saved}"
+        )
+
+
+def run(args) -> tuple:
+    """
+    Fetch the books `args` asks for and insert them, or append them to
+    --output-jsonl. Returns the per-author AuthorYield results and the
+    (closed) client, whose pool and latency stats are still readable.
+    """
+    limit = args.limit
+    database_url = args.db
+
+    if args.authors_file:
+        authors = read_authors_file(args.authors_file)
+        if not authors:
+            logger.warning(f"No authors listed in {args.authors_file}.")
+            return [], None
+    else:
+        authors = [args.author]
+
+    logger.info("Starting book fetch process.")
+    logger.info(f"Authors: {', '.join(authors)}, Limit: {limit} per author")
+
+    session = None
+    if database_url:
+        try:
+            engine = create_engine(database_url)
+            SessionLocal = sessionmaker(bind=engine)
+            session = SessionLocal()
+            logger.info("Database connection established.")
+        except Exception as e:
+            logger.error(f"Database connection failed: {e}")
+            return [], None
+
+    cache = None if args.no_cache else ResponseCache(args.cache_path, args.cache_ttl)
+
+    # Every author thread may keep `concurrency` edition requests in flight
+    in_flight = args.concurrency * min(max(args.author_workers, 1), len(authors))
+
+    client = OpenLibraryClient(
+        rate_limit_delay=args.rate_limit_delay,
+        pool_size=max(args.pool_size, in_flight),
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        compression=not args.no_compression,
+        cache=cache,
+        offline=args.offline,
+        base_url=args.base_url,
+        max_retries=args.max_retries,
+        adaptive=not args.no_adaptive
+    )
+
+    sink = None
+    try:
+        catalogue = Catalogue.load(session) if session is not None else Catalogue()
+        if args.output_jsonl:
+            if os.path.exists(args.output_jsonl):
+                catalogue.add_jsonl(args.output_jsonl)
+            sink = JsonlSink(args.output_jsonl)
+        logger.info(f"Catalogue loaded: {len(catalogue.isbns)} ISBNs, {len(catalogue.titles)} titles.")
+
+        results = fetch_authors(client, authors, args, catalogue, sink)
+
+        logger.info(f"Total Valid Books Collected: {sum(len(r.books) for r in results)}")
+
+        if sink is not None:
+            logger.info(f"Books written to {sink.path}: {sink.written}.")
+            log_author_yields(results, limit, saved="written")
+        else:
+            logger.info("Inserting books into database...")
+
+            # One commit per author, so a duplicate ISBN only loses that author's books
+            for result in results:
+                if result.books:
+                    result.inserted = insert_books(session, result.books)
+
+            logger.info(f"Books inserted: {sum(r.inserted for r in results)}.")
+            log_author_yields(results, limit)
     finally:
-        session.close()
-        logger.info("Database session closed.")
+        if sink is not None:
+            sink.close()
+        if session is not None:
+            session.close()
+            logger.info("Database session closed.")
+        log_pool_stats(client)
+        client.close()
         logger.info("Process completed.")
 
+    return results, client
+
+
+def main():
+    run(parse_arguments())
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,176 @@
+## Imports
+
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models import Base, Library
+from mock_openlibrary import MockOpenLibrary, SyntheticCatalogue
+import api_fetcher
+
+
+## Benchmark
+
+
+def create_database(path: str) -> str:
+    """Empty SQLite catalogue holding the library api_fetcher files books under."""
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(Library(
+            library_id=6,
+            name="Benchmark Library",
+            campus_location="Local",
+            contact_email="benchmark@example.org",
+            phone_number="9000000006"
+        ))
+        session.commit()
+
+    engine.dispose()
+    return url
+
+
+def run_benchmark(args, fetcher_args: list) -> dict:
+    """
+    Serve a synthetic catalogue locally, run api_fetcher against it
+    in-process with a fresh database and no response cache, and measure
+    the run.
+    """
+    server = MockOpenLibrary(
+        catalogue=SyntheticCatalogue(args.works, args.invalid_every),
+        latency=args.server_latency,
+        jitter=args.server_jitter,
+        rate_limit=args.server_rate_limit
+    )
+    server.start()
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            authors_file = os.path.join(temp_dir, "authors.txt")
+            with open(authors_file, "w", encoding="utf-8") as f:
+                f.writelines(f"Author {n}\n" for n in range(1, args.authors + 1))
+
+            fetcher = api_fetcher.parse_arguments([
+                "--authors-file", authors_file,
+                "--limit", str(args.limit),
+                "--db", create_database(os.path.join(temp_dir, "benchmark.db")),
+                "--base-url", server.base_url,
+                "--no-cache",
+                *fetcher_args
+            ])
+
+            started = time.perf_counter()
+            results, client = api_fetcher.run(fetcher)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    books = sum(len(result.books) for result in results)
+    requests_sent = client.pool_stats()["requests"] if client else 0
+    p50 = client.latency_percentile(50) if client else None
+    p95 = client.latency_percentile(95) if client else None
+
+    return {
+        "fetcher_args": fetcher_args,
+        "elapsed_seconds": round(elapsed, 3),
+        "books": books,
+        "requests": requests_sent,
+        "books_per_second": round(books / elapsed, 2) if elapsed else None,
+        "requests_per_book": round(requests_sent / books, 2) if books else None,
+        "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        "scheduler": client.scheduler_stats() if client else {},
+        "server": dict(server.stats)
+    }
+
+
+## Entry Point
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark api_fetcher against a local mock OpenLibrary. "
+            "Options not listed here are passed to api_fetcher "
+            "(e.g. --concurrency 8 --strategy search --rate-limit-delay 0)."
+        ),
+        allow_abbrev=False
+    )
+
+    parser.add_argument("--authors", type=int, default=5, help="Authors fetched in one run (default: 5)")
+    parser.add_argument("--limit", type=int, default=20, help="Valid books fetched per author (default: 20)")
+    parser.add_argument("--works", type=int, default=40, help="Works per synthetic author (default: 40)")
+
+    parser.add_argument(
+        "--invalid-every",
+        type=int,
+        default=4,
+        help="Every Nth work has no ISBN; 0 for none (default: 4)"
+    )
+
+    parser.add_argument(
+        "--server-latency",
+        type=float,
+        default=0.05,
+        help="Seconds the mock server adds to each response (default: 0.05)"
+    )
+
+    parser.add_argument(
+        "--server-jitter",
+        type=float,
+        default=0.0,
+        help="Random ± seconds around --server-latency (default: 0)"
+    )
+
+    parser.add_argument(
+        "--server-rate-limit",
+        type=float,
+        default=None,
+        help="Requests per second the mock serves before answering 429 (default: unlimited)"
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Also write the results as JSON to this path"
+    )
+
+    return parser.parse_known_args()
+
+
+def main():
+    args, fetcher_args = parse_arguments()
+    report = run_benchmark(args, fetcher_args)
+
+    print(f"fetcher args:      {' '.join(fetcher_args) or '(defaults)'}")
+    print(f"elapsed:           {report['elapsed_seconds']:.2f} s")
+    print(f"valid books:       {report['books']}")
+    print(f"HTTP requests:     {report['requests']}")
+    print(f"books/second:      {report['books_per_second']}")
+    print(f"requests/book:     {report['requests_per_book']}")
+    print(f"latency p50/p95:   {report['p50_latency_ms']} / {report['p95_latency_ms']} ms")
+    print(f"scheduler:         {report['scheduler']}")
+    print(f"server responses:  {report['server']}")
+
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    return 0 if report["books"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+## End
@@ -10,22 +10,78 @@
 ## Imports
 
 
+import io
 import os
+import sys
 import csv
+import gzip
+import json
+import time
+import hashlib
+import queue
+import atexit
 import logging
+import logging.handlers
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Optional, get_args
 
-from sqlalchemy import create_engine
+from sqlalchemy import and_, bindparam, create_engine, insert, or_, select, text, tuple_, update
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import IntegrityError
 import argparse
 
-from models import Library, Author, Book, Member
+# Unavailable on Windows; only used where /proc is missing
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Optional input formats: .csv.zst needs zstandard, .parquet needs pyarrow
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = pq = None
+
+from db_utils import has_unique_key, insert_ignore, upsert
+from models import (
+    Library,
+    Author,
+    Book,
+    Member,
+    Category,
+    BookAuthor,
+    BookCategory,
+    Borrowing,
+    Review,
+    IngestFingerprint
+)
 from schemas import (
     LibrarySchema,
     AuthorSchema,
     BookSchema,
-    MemberSchema
+    MemberSchema,
+    BookAuthorSchema,
+    BookCategorySchema,
+    BorrowingSchema,
+    ReviewSchema,
+    DATE_PARSE_STATS,
+    configure_normalizer_cache,
+    date_parse_stats,
+    normalizer_cache_stats,
+    validation_counters,
+    merge_validation_counters
 )
 
 # ==========================================================
@@ -50,7 +106,18 @@ def configure_logging(log_level: str):
     )
     file_handler.setFormatter(formatter)
 
-    root_logger.addHandler(file_handler)
+    if numeric_level > logging.DEBUG:
+        root_logger.addHandler(file_handler)
+        return
+
+    # Per-row DEBUG records go through a queue so file I/O stays off the
+    # ingestion thread; the listener writes them in the background.
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
 logger = logging.getLogger(__name__)
 
@@ -90,189 +157,1873 @@ def session_scope(Session):
 
 
 # ==========================================================
-# CSV Reader
+# Input Readers
 # ==========================================================
 
-def stream_csv(file_path: str):
-    with open(file_path, newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        for row_number, row in enumerate(reader, start=2):
+# Tried in order for each table's input file
+INPUT_SUFFIXES = (".csv", ".csv.gz", ".csv.zst", ".parquet")
+PARQUET_BATCH_ROWS = 10_000
+
+
+class ColumnCheckError(ValueError):
+    """Stands in for a row that failed a column-wise check on its batch."""
+
+
+def find_input(directory_path: str, stem: str) -> Optional[str]:
+    for suffix in INPUT_SUFFIXES:
+        file_path = os.path.join(directory_path, stem + suffix)
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def _skip_committed(rows, start: Optional[tuple]):
+    """Drop rows up to a checkpoint that has no byte offset to seek to."""
+    for row_number, row in rows:
+        if start is None or row_number > start[0]:
+            yield row_number, row
+
+
+def _open_compressed_csv(file_path: str):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", encoding="utf-8", newline="")
+
+    if zstandard is None:
+        raise ImportError(f"Reading {file_path} requires the zstandard package.")
+    stream = zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"))
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+
+def stream_csv(file_path: str, start: Optional[tuple] = None, positions: Optional[deque] = None):
+    """
+    Yield (row_number, row) pairs. `start` is a (row_number, offset)
+    checkpoint to resume after. When `positions` is given, the byte
+    offset reached after each row is appended to it as
+    (row_number, offset). Compressed files have no usable offset, so
+    they record None and resume by skipping committed rows.
+    """
+    if not file_path.endswith(".csv"):
+        with _open_compressed_csv(file_path) as file:
+            rows = enumerate(csv.DictReader(file), start=2)
+            for row_number, row in _skip_committed(rows, start):
+                if positions is not None:
+                    positions.append((row_number, None))
+                yield row_number, row
+        return
+
+    with open(file_path, "rb") as file:
+        # csv reads one line at a time, so tell() lands on row boundaries
+        lines = (line.decode("utf-8") for line in iter(file.readline, b""))
+        reader = csv.DictReader(lines)
+        first_row = 2
+
+        if start is not None:
+            # Read the header before jumping past the committed rows
+            _ = reader.fieldnames
+            last_row, offset = start
+            file.seek(offset)
+            first_row = last_row + 1
+
+        for row_number, row in enumerate(reader, start=first_row):
+            if positions is not None:
+                positions.append((row_number, file.tell()))
             yield row_number, row
 
 
+class CheckedRow(dict):
+    """Values that passed every column-wise check; used without the pydantic schema."""
+
+
+# Column-wise checks for Parquet input. Each takes an Arrow column and
+# returns (mask, values): the non-null entries the schema would accept
+# unchanged and the values to use for them, or None when the column's
+# type is not handled. Rows failing any check go through the schema.
+
+NAME_PATTERN = r"^[A-Z0-9][a-z0-9]*( [A-Z0-9][a-z0-9]*)*$"
+ISO_DATE_PATTERN = r"^[1-9][0-9]{3}-[0-9]{2}-[0-9]{2}$"
+ISBN13_PATTERN = r"^97[89][0-9]{10}$"
+
+
+def _is_string(column) -> bool:
+    return pa.types.is_string(column.type) or pa.types.is_large_string(column.type)
+
+
+def _check_name(column):
+    """Names normalize_name would leave unchanged."""
+    if not _is_string(column):
+        return None
+    return pc.match_substring_regex(column, NAME_PATTERN), column
+
+
+def _check_stripped(column):
+    if not _is_string(column):
+        return None
+    return pc.match_substring_regex(column, r"^\S(?:[\s\S]*\S)?$"), column
+
+
+def _check_text(column):
+    if not _is_string(column):
+        return None
+    return pc.is_valid(column), column
+
+
+def _check_int(column):
+    if not pa.types.is_integer(column.type):
+        return None
+    return pc.is_valid(column), column
+
+
+def _check_isbn(column):
+    """ISBN-13s without separators and with a valid check digit; ISBN-10s are left to the schema."""
+    if pa.types.is_integer(column.type):
+        column = pc.cast(column, pa.string())
+    if not _is_string(column):
+        return None
+
+    shaped = pc.match_substring_regex(column, ISBN13_PATTERN)
+    digits = pc.if_else(shaped, column, "0000000000000")
+    total = pa.scalar(0, pa.int64())
+    for position in range(13):
+        digit = pc.cast(pc.utf8_slice_codeunits(digits, position, position + 1), pa.int64())
+        total = pc.add(total, pc.multiply(digit, 3 if position % 2 else 1))
+
+    remainder = pc.subtract(total, pc.multiply(pc.divide(total, 10), 10))
+    return pc.and_(shaped, pc.equal(remainder, 0)), column
+
+
+def _check_date(column):
+    """Date and timestamp columns, or ISO date strings that name a real day."""
+    if pa.types.is_date(column.type):
+        return pc.is_valid(column), pc.cast(column, pa.date32())
+    if pa.types.is_timestamp(column.type) and column.type.tz is None:
+        return pc.is_valid(column), pc.cast(column, pa.date32(), safe=False)
+    if not _is_string(column):
+        return None
+
+    shaped = pc.match_substring_regex(column, ISO_DATE_PATTERN)
+    parsed = pc.cast(
+        pc.strptime(pc.if_else(shaped, column, None), format="%Y-%m-%d", unit="s", error_is_null=True),
+        pa.date32()
+    )
+    # strptime rolls "2001-02-30" over into March; keep only exact round trips
+    return pc.equal(pc.cast(parsed, pa.string()), column), parsed
+
+
+def _check_copies(values: dict):
+    """Copy counts the book table's CHECK constraints accept."""
+    total, available = values["total_copies"], values["available_copies"]
+    return pc.and_(pc.greater_equal(available, 0), pc.less_equal(available, total))
+
+
+PARQUET_CHECKS = {
+    AuthorSchema: {
+        "first_name": _check_name,
+        "last_name": _check_name,
+        "birth_date": _check_date,
+        "nationality": _check_text,
+        "biography": _check_text,
+    },
+    BookSchema: {
+        "title": _check_name,
+        "isbn": _check_isbn,
+        "publication_date": _check_date,
+        "total_copies": _check_int,
+        "available_copies": _check_int,
+        "library_id": _check_int,
+    },
+    BookAuthorSchema: {
+        "isbn": _check_isbn,
+        "author_first_name": _check_name,
+        "author_last_name": _check_name,
+        "author_birth_date": _check_date,
+    },
+    BookCategorySchema: {
+        "isbn": _check_isbn,
+        "category_name": _check_stripped,
+    },
+}
+
+# Checks spanning several columns of one row
+PARQUET_ROW_CHECKS = {
+    BookSchema: _check_copies,
+}
+
+
+def _parquet_rows(batch, spec) -> list:
+    """
+    Check a record batch one column at a time with pyarrow.compute.
+    Returns one entry per row: a CheckedRow when every field passed,
+    a ColumnCheckError when a required field is missing, otherwise a
+    dict of the raw values for the pydantic schema. Each cell is
+    converted to a Python object once, from whichever side it lands on.
+    """
+    names = set(batch.schema.names)
+    checks = PARQUET_CHECKS.get(spec.schema, {})
+    fast = all(name in checks for name in spec.fields)
+
+    raw, checked, defaults = {}, {}, {}
+    problems = [None] * batch.num_rows
+    passed = pa.array([fast] * batch.num_rows, pa.bool_())
+
+    for name in spec.fields:
+        field = spec.schema.model_fields[name]
+
+        if name not in names:
+            if field.is_required():
+                problems = [(p or []) + [f"{name}: Field required"] for p in problems]
+                passed = pa.array([False] * batch.num_rows, pa.bool_())
+            else:
+                defaults[name] = field.default
+            continue
+
+        column = batch.column(name)
+
+        if fast:
+            result = checks[name](column)
+            if result is None:
+                fast = False
+                passed = pa.array([False] * batch.num_rows, pa.bool_())
+            else:
+                mask, checked[name] = result
+                mask = pc.if_else(pc.is_null(column), not field.is_required(), pc.fill_null(mask, False))
+                passed = pc.and_(passed, mask)
+
+        # Phone numbers and ISBNs are often exported as integers
+        if pa.types.is_integer(column.type) and int not in (field.annotation, *get_args(field.annotation)):
+            column = pc.cast(column, pa.string())
+
+        if field.is_required() and column.null_count:
+            for i, missing in enumerate(column.is_null().to_pylist()):
+                if missing:
+                    problems[i] = (problems[i] or []) + [f"{name}: Field required"]
+
+        raw[name] = column
+
+    row_check = PARQUET_ROW_CHECKS.get(spec.schema)
+    if fast and row_check is not None and all(name in checked for name in spec.fields):
+        passed = pc.and_(passed, pc.fill_null(row_check(checked), False))
+
+    # Date strings read here never reach normalize_date's counters
+    for name, values in checked.items():
+        if checks[name] is _check_date and _is_string(raw[name]):
+            DATE_PARSE_STATS["iso"] += pc.sum(pc.and_(passed, pc.is_valid(values))).as_py() or 0
+
+    failed = pc.invert(passed)
+    passing = {name: pc.filter(values, passed).to_pylist() for name, values in checked.items()} if fast else {}
+    failing = {name: pc.filter(values, failed).to_pylist() for name, values in raw.items()}
+
+    rows, next_passing, next_failing = [], 0, 0
+    for i, ok in enumerate(passed.to_pylist()):
+        if ok:
+            row = CheckedRow({name: values[next_passing] for name, values in passing.items()}, **defaults)
+            next_passing += 1
+        else:
+            if problems[i]:
+                row = ColumnCheckError("\n".join(problems[i]))
+            else:
+                row = {name: values[next_failing] for name, values in failing.items()}
+            next_failing += 1
+        rows.append(row)
+
+    return rows
+
+
+def stream_parquet(file_path: str, spec, start: Optional[tuple] = None, positions: Optional[deque] = None):
+    """
+    Yield (row_number, row) pairs from a Parquet file, read in record
+    batches of PARQUET_BATCH_ROWS with only the table's columns and
+    checked column-wise (see _parquet_rows). Row numbers follow the CSV
+    convention (the first row is 2). Resume skips the row groups before
+    the checkpoint unread and slices off the committed rows of the
+    group it falls in.
+    """
+    if pq is None:
+        raise ImportError(f"Reading {file_path} requires the pyarrow package.")
+
+    parquet_file = pq.ParquetFile(file_path)
+    names = set(parquet_file.schema_arrow.names)
+    last_row = start[0] if start is not None else 1
+    first_row = 2
+
+    # Whole row groups already committed are never decoded
+    row_groups = list(range(parquet_file.num_row_groups))
+    while row_groups:
+        group_rows = parquet_file.metadata.row_group(row_groups[0]).num_rows
+        if first_row + group_rows - 1 > last_row:
+            break
+        first_row += group_rows
+        row_groups.pop(0)
+
+    if not row_groups:
+        return
+
+    for batch in parquet_file.iter_batches(
+        batch_size=PARQUET_BATCH_ROWS,
+        row_groups=row_groups,
+        columns=[name for name in spec.fields if name in names]
+    ):
+        skip = min(max(last_row - first_row + 1, 0), batch.num_rows)
+        if skip:
+            batch = batch.slice(skip)
+            first_row += skip
+            if not batch.num_rows:
+                continue
+
+        for i, row in enumerate(_parquet_rows(batch, spec)):
+            if positions is not None:
+                positions.append((first_row + i, None))
+            yield first_row + i, row
+
+        first_row += batch.num_rows
+
+
+def stream_input(file_path: str, spec, start: Optional[tuple] = None, positions: Optional[deque] = None):
+    if file_path.endswith(".parquet"):
+        return stream_parquet(file_path, spec, start, positions)
+    return stream_csv(file_path, start, positions)
+
+
 # ==========================================================
-# Processing Functions
+# Checkpoints
 # ==========================================================
 
-def process_libraries(session, file_path: str):
-    for row_number, row in stream_csv(file_path):
+CHECKPOINT_FILE = ".ingest_checkpoint.json"
+
+
+class Checkpoint:
+    """
+    Sidecar JSON file recording, per input file, the last committed row
+    number and the byte offset just past it (None for compressed and
+    Parquet inputs). Written atomically after each commit so a crashed
+    run can resume from it.
+    """
+
+    def __init__(self, path: str, files: Optional[dict] = None):
+        self.path = path
+        self.files = files or {}
+        # Tables loaded in parallel share one checkpoint file
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str):
+        if not os.path.exists(path):
+            return cls(path)
+
+        with open(path, encoding="utf-8") as file:
+            return cls(path, json.load(file).get("files", {}))
+
+    def is_complete(self, file_name: str) -> bool:
+        return self.files.get(file_name, {}).get("complete", False)
+
+    def position(self, file_name: str) -> Optional[tuple]:
+        entry = self.files.get(file_name)
+        if not entry or entry["row_number"] <= 1:
+            return None
+        return entry["row_number"], entry.get("offset")
+
+    def record(self, file_name: str, row_number: int, offset: Optional[int], complete: bool = False):
+        with self._lock:
+            self.files[file_name] = {
+                "row_number": row_number,
+                "offset": offset,
+                "complete": complete
+            }
+
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump({"files": self.files}, file, indent=2)
+            os.replace(temp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class FileProgress:
+    """
+    Commits the session, empties its identity map and advances the
+    checkpoint for one input file.
+    """
+
+    def __init__(self, checkpoint: Checkpoint, file_name: str, start: Optional[tuple] = None):
+        self.checkpoint = checkpoint
+        self.file_name = file_name
+        self.positions = deque()
+        self.row_number, self.offset = start or (1, None)
+
+    def commit(self, session, row_number: Optional[int] = None, complete: bool = False):
+        session.commit()
+        # Nothing written so far is needed again; keep memory flat per chunk
+        session.expunge_all()
 
-        logger.debug(f"Libraries: Processing row {row_number - 1}: {row}")
+        while self.positions and (complete or self.positions[0][0] <= row_number):
+            self.row_number, self.offset = self.positions.popleft()
 
-        try:
-            validated = LibrarySchema(**row)
+        self.checkpoint.record(self.file_name, self.row_number, self.offset, complete)
+        if complete:
+            logger.info(f"Checkpoint: {self.file_name} committed.")
+        else:
+            logger.info(
+                f"Checkpoint: {self.file_name} committed through row "
+                f"{self.row_number - 1}."
+            )
 
-            with session.begin_nested():
 
-                library = Library(
-                    name=validated.name,
-                    campus_location=validated.campus_location,
-                    contact_email=validated.contact_email,
-                    phone_number=validated.phone_number
-                )
+# ==========================================================
+# Run Metrics
+# ==========================================================
 
-                session.add(library)
-                session.flush()
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
 
-            logger.info(f"Libraries: Row {row_number - 1} inserted.")
 
-        except IntegrityError:
-            logger.warning(f"Libraries: Row {row_number - 1} duplicate.")
-        except Exception as e:
-            logger.error(f"Libraries: Row {row_number - 1} error:\n{e}")
+def resident_memory() -> Optional[int]:
+    """
+    Resident set size of this process in bytes. Without /proc, falls
+    back to the peak so far from getrusage.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class TableStats:
+    """Row outcomes, time spent per stage and peak memory for one table."""
 
+    OUTCOMES = ("inserted", "updated", "unchanged", "duplicate", "rejected")
+    STAGES = ("parse", "validate", "write")
 
-def process_authors(session, file_path: str):
-    for row_number, row in stream_csv(file_path):
+    def __init__(self, label: str):
+        self.label = label
+        self.counts = dict.fromkeys(self.OUTCOMES, 0)
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+        # Process-wide, so tables loaded in parallel share their peaks
+        self.peak_rss = 0
 
-        logger.debug(f"Authors: Processing row {row_number - 1}: {row}")
+    def count(self, outcome: str, rows: int = 1):
+        self.counts[outcome] += rows
 
+    def sample_memory(self):
+        self.peak_rss = max(self.peak_rss, resident_memory() or 0)
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
         try:
-            validated = AuthorSchema(**row)
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+    def timed_iter(self, stage: str, iterable, exclude: Optional[str] = None):
+        """
+        Charge the time spent producing each item to `stage`. Time an
+        inner iterator charged to `exclude` meanwhile is not counted twice.
+        """
+        iterator = iter(iterable)
+        while True:
+            inner_before = self.seconds[exclude] if exclude else 0.0
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed = time.perf_counter() - start
+                if exclude:
+                    elapsed -= self.seconds[exclude] - inner_before
+                self.seconds[stage] += elapsed
+            yield item
+
+    def as_dict(self) -> dict:
+        return {
+            **self.counts,
+            "seconds": {stage: round(value, 3) for stage, value in self.seconds.items()},
+            "peak_rss_mb": round(self.peak_rss / 2**20, 1)
+        }
+
+
+class RunMetrics:
+    """Per-table counters for one ingestion run, emitted once as JSON."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.tables = {}
+
+    def table(self, label: str) -> TableStats:
+        if label not in self.tables:
+            self.tables[label] = TableStats(label)
+        return self.tables[label]
+
+    def summary(self) -> dict:
+        return {
+            "elapsed_seconds": round(time.perf_counter() - self.started, 3),
+            "tables": {label: stats.as_dict() for label, stats in self.tables.items()},
+            "date_formats": date_parse_stats(),
+            "normalizer_cache": normalizer_cache_stats()
+        }
+
+    def emit(self, metrics_path: Optional[str] = None):
+        summary = json.dumps(self.summary())
+        logger.info(f"Run summary: {summary}")
+
+        if metrics_path:
+            with open(metrics_path, "w", encoding="utf-8") as file:
+                file.write(summary)
 
-            existing_author = session.query(Author).filter_by(
-                first_name=validated.first_name,
-                last_name=validated.last_name,
-                birth_date=validated.birth_date
-            ).first()
 
-            if existing_author:
-                logger.warning(
-                    f"Authors: Row {row_number - 1} duplicate."
-                )
-                continue
+# ==========================================================
+# Row Writers
+# ==========================================================
 
+def _write_row(session, statement, params: dict, stats: TableStats, outcome: str, row_number: int, count_matched: bool = False) -> bool:
+    try:
+        with session.begin_nested():
+            result = session.execute(statement, [params])
+
+        if count_matched and result.rowcount == 0:
+            outcome = "unchanged"
+        stats.count(outcome)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{stats.label}: Row {row_number - 1} {outcome}.")
+        return True
+
+    except IntegrityError:
+        stats.count("duplicate")
+        logger.warning(f"{stats.label}: Row {row_number - 1} duplicate.")
+    except Exception as e:
+        stats.count("rejected")
+        logger.error(f"{stats.label}: Row {row_number - 1} error:\n{e}")
+    return False
+
+
+def _write_batch(session, statement, batch: list, stats: TableStats, outcome: str, to_params=None, count_matched: bool = False) -> list:
+    """
+    Execute `statement` for a batch of (row_number, values) pairs with
+    one executemany call. If the batch fails (a constraint, an
+    over-long value, any database error), only that batch is replayed
+    row by row so duplicates and bad rows are still reported per row.
+    With `count_matched`, rows the statement did not affect count as
+    unchanged. Returns the pairs that were written.
+    """
+    to_params = to_params or (lambda values: values)
+
+    if len(batch) > 1:
+        try:
             with session.begin_nested():
+                result = session.execute(statement, [to_params(values) for _, values in batch])
 
-                author = Author(
-                    first_name=validated.first_name,
-                    last_name=validated.last_name,
-                    birth_date=validated.birth_date,
-                    nationality=validated.nationality,
-                    biography=validated.biography
+        except Exception as e:
+            logger.debug(
+                f"{stats.label}: Batch of {len(batch)} rows failed ({e.__class__.__name__}), "
+                f"falling back to row-by-row writes."
+            )
+
+        else:
+            if count_matched and session.bind.dialect.supports_sane_multi_rowcount:
+                # Only the total is known, not which rows were affected
+                stats.count(outcome, result.rowcount)
+                stats.count("unchanged", len(batch) - result.rowcount)
+                logger.debug(
+                    f"{stats.label}: Batch of {len(batch)} rows, "
+                    f"{result.rowcount} {outcome}."
                 )
+                return batch
+
+            stats.count(outcome, len(batch))
+            if logger.isEnabledFor(logging.DEBUG):
+                for row_number, _ in batch:
+                    logger.debug(f"{stats.label}: Row {row_number - 1} {outcome}.")
+            return batch
+
+    return [
+        (row_number, values)
+        for row_number, values in batch
+        if _write_row(session, statement, to_params(values), stats, outcome, row_number, count_matched)
+    ]
 
-                session.add(author)
-                session.flush()
 
-            logger.info(f"Authors: Row {row_number - 1} inserted.")
+def _insert_batch(session, model, stats: TableStats, batch: list) -> list:
+    return _write_batch(session, insert(model), batch, stats, "inserted")
 
-        except IntegrityError:
-            logger.warning(f"Authors: Row {row_number - 1} duplicate.")
-        except Exception as e:
-            logger.error(f"Authors: Row {row_number - 1} error:\n{e}")
 
+def _insert_ignore_batch(session, spec, stats: TableStats, batch: list) -> list:
+    """
+    Write a batch with one INSERT ... ON CONFLICT DO NOTHING, for tables
+    whose unique constraints stand in for UniqueKeyIndex. Rows whose
+    natural key is not returned collided with a stored row (or an
+    earlier row of the batch) and count as duplicates. Returns the
+    pairs that were written.
+    """
+    table = spec.model.__table__
+    statement = insert_ignore(
+        session.connection(), spec.model
+    ).returning(*(table.c[column] for column in spec.natural_key))
+
+    try:
+        with session.begin_nested():
+            result = session.execute(statement, [values for _, values in batch])
+            written_keys = {tuple(row) for row in result}
+
+    except Exception as e:
+        if len(batch) > 1:
+            logger.debug(
+                f"{stats.label}: Batch of {len(batch)} rows failed ({e.__class__.__name__}), "
+                f"falling back to row-by-row inserts."
+            )
+            return [
+                pair
+                for item in batch
+                for pair in _insert_ignore_batch(session, spec, stats, [item])
+            ]
+        stats.count("rejected")
+        logger.error(f"{stats.label}: Row {batch[0][0] - 1} error:\n{e}")
+        return []
+
+    written = []
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for row_number, values in batch:
+        key = tuple(values[column] for column in spec.natural_key)
+        if key not in written_keys:
+            stats.count("duplicate")
+            logger.warning(f"{stats.label}: Row {row_number - 1} duplicate.")
+            continue
+
+        # Only the first row with a key was inserted
+        written_keys.discard(key)
+        written.append((row_number, values))
+        stats.count("inserted")
+        if debug:
+            logger.debug(f"{stats.label}: Row {row_number - 1} inserted.")
+
+    return written
+
+
+def _update_batch(session, spec, stats: TableStats, batch: list) -> list:
+    """
+    Update existing rows matched on the table's natural key, leaving
+    rows whose values are unchanged untouched.
+    """
+    table = spec.model.__table__
+    changed = [column for column in spec.columns if column not in spec.natural_key]
+    statement = update(table).where(
+        and_(*(
+            table.c[column].is_not_distinct_from(bindparam(f"key_{column}"))
+            for column in spec.natural_key
+        )),
+        or_(*(
+            table.c[column].is_distinct_from(bindparam(f"new_{column}"))
+            for column in changed
+        ))
+    )
 
-def process_books(session, file_path: str):
-    for row_number, row in stream_csv(file_path):
+    def to_params(values):
+        return {
+            **values,
+            **{f"key_{column}": values[column] for column in spec.natural_key},
+            **{f"new_{column}": values[column] for column in changed}
+        }
+
+    return _write_batch(session, statement, batch, stats, "updated", to_params, count_matched=True)
+
+
+def _upsert_batch(session, spec, stats: TableStats, batch: list, existing: set) -> list:
+    """
+    Write a batch with one INSERT ... ON CONFLICT (natural key) DO UPDATE.
+    Rows whose row number is in `existing` count as updated when they
+    changed and unchanged otherwise. If the batch fails (a constraint,
+    an over-long value, any database error), it is replayed row by row.
+    Returns the pairs that were written.
+    """
+    table = spec.model.__table__
+    statement = upsert(
+        session.connection(), spec.model, spec.natural_key, spec.columns
+    ).returning(*(table.c[column] for column in spec.natural_key))
 
-        logger.debug(f"Books: Processing row {row_number - 1}: {row}")
+    try:
+        with session.begin_nested():
+            result = session.execute(statement, [values for _, values in batch])
+            written_keys = {tuple(row) for row in result}
 
-        try:
-            validated = BookSchema(**row)
+    except Exception as e:
+        if len(batch) > 1:
+            logger.debug(
+                f"{stats.label}: Batch of {len(batch)} rows failed ({e.__class__.__name__}), "
+                f"falling back to row-by-row upserts."
+            )
+            return [
+                pair
+                for item in batch
+                for pair in _upsert_batch(session, spec, stats, [item], existing)
+            ]
+        if isinstance(e, IntegrityError):
+            stats.count("duplicate")
+            logger.warning(f"{stats.label}: Row {batch[0][0] - 1} duplicate.")
+            return []
+        stats.count("rejected")
+        logger.error(f"{stats.label}: Row {batch[0][0] - 1} error:\n{e}")
+        return []
+
+    written = []
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for row_number, values in batch:
+        if tuple(values[column] for column in spec.natural_key) not in written_keys:
+            outcome = "unchanged"
+        else:
+            outcome = "updated" if row_number in existing else "inserted"
+            written.append((row_number, values))
+
+        stats.count(outcome)
+        if debug:
+            logger.debug(f"{stats.label}: Row {row_number - 1} {outcome}.")
+
+    return written
+
+
+def _write_changes(session, spec, stats: TableStats, inserts: list, updates: list, upsert_rows: bool = False, ignore_conflicts: bool = False) -> list:
+    """
+    Write new and changed rows. With `upsert_rows`, both go through one
+    ON CONFLICT statement; updates whose natural key holds a NULL cannot
+    be matched by ON CONFLICT and are updated by key instead. With
+    `ignore_conflicts`, inserts colliding with stored rows are skipped
+    by the database and counted as duplicates.
+    """
+    if spec.on_update is not None:
+        updates = [(row_number, spec.on_update(values)) for row_number, values in updates]
+
+    if not upsert_rows:
+        if not inserts:
+            written = []
+        elif ignore_conflicts:
+            written = _insert_ignore_batch(session, spec, stats, inserts)
+        else:
+            written = _insert_batch(session, spec.model, stats, inserts)
+        if updates:
+            written += _update_batch(session, spec, stats, updates)
+        return written
+
+    matched, unmatched = [], []
+    for pair in updates:
+        key = [pair[1][column] for column in spec.natural_key]
+        (unmatched if None in key else matched).append(pair)
+
+    written = []
+    if inserts or matched:
+        existing = {row_number for row_number, _ in matched}
+        written += _upsert_batch(session, spec, stats, inserts + matched, existing)
+    if unmatched:
+        written += _update_batch(session, spec, stats, unmatched)
+    return written
+
+
+# ==========================================================
+# Ingestion Options & Table Specs
+# ==========================================================
+
+@dataclass
+class IngestOptions:
+    batch_size: int = 1
+    loader: str = "orm"
+    workers: int = 1
+    # 0 keeps one transaction per run; otherwise commit and checkpoint every N rows
+    commit_every: int = 0
+    resume: bool = False
+    # Load independent tables concurrently, one session per table
+    parallel_tables: bool = False
+    # Skip rows whose fingerprint is unchanged and update changed ones
+    incremental: bool = False
+    # "ignore" reports rows with an existing natural key as duplicates;
+    # "update" upserts them
+    on_conflict: str = "ignore"
+    # None keeps the schemas' default (NORMALIZER_CACHE_SIZE)
+    normalizer_cache_size: Optional[int] = None
+    # False skips loading every stored key into memory where the database
+    # can reject duplicates itself (see _needs_key_index)
+    unique_index: bool = True
+
+
+@dataclass(frozen=True)
+class NaturalKey:
+    """Input `fields` that name a `model` row by its unique `key` columns."""
+    # Column filled with the resolved primary key
+    column: str
+    model: type
+    key: tuple
+    fields: tuple
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    label: str
+    schema: type
+    model: type
+    columns: tuple
+    # Each entry is one unique constraint, as a tuple of column names
+    unique_keys: tuple = ()
+    # (column, referenced model) pairs checked against ForeignKeyResolver
+    references: tuple = ()
+    # NaturalKey lookups resolved to IDs through ForeignKeyResolver
+    lookups: tuple = ()
+    # Adjusts the values written over an existing row
+    on_update: Optional[Callable] = None
+
+    @property
+    def natural_key(self) -> tuple:
+        # The first unique key identifies a row for updates and fingerprints
+        return self.unique_keys[0]
+
+    @property
+    def fields(self) -> tuple:
+        """Schema fields kept from each input row."""
+        resolved = {lookup.column for lookup in self.lookups}
+        return (
+            tuple(column for column in self.columns if column not in resolved)
+            + tuple(field for lookup in self.lookups for field in lookup.fields)
+        )
+
+    @property
+    def parents(self) -> tuple:
+        """(column, model) for every foreign key, given by ID or natural key."""
+        return self.references + tuple(
+            (lookup.column, lookup.model) for lookup in self.lookups
+        )
+
+
+class DuplicateRowError(Exception):
+    pass
+
+
+LIBRARIES = TableSpec(
+    label="Libraries",
+    schema=LibrarySchema,
+    model=Library,
+    columns=("name", "campus_location", "contact_email", "phone_number"),
+    unique_keys=(("contact_email",), ("phone_number",))
+)
+
+AUTHORS = TableSpec(
+    label="Authors",
+    schema=AuthorSchema,
+    model=Author,
+    columns=("first_name", "last_name", "birth_date", "nationality", "biography"),
+    unique_keys=(("first_name", "last_name", "birth_date"),)
+)
+
+def _clamp_available_copies(values: dict) -> dict:
+    # Keep chk_available_copies when a refresh lowers total_copies
+    available = min(values["available_copies"], values["total_copies"])
+    return {**values, "available_copies": available}
+
+
+BOOKS = TableSpec(
+    label="Books",
+    schema=BookSchema,
+    model=Book,
+    columns=(
+        "title", "isbn", "publication_date",
+        "total_copies", "available_copies", "library_id"
+    ),
+    unique_keys=(("isbn",),),
+    references=(("library_id", Library),),
+    on_update=_clamp_available_copies
+)
+
+MEMBERS = TableSpec(
+    label="Members",
+    schema=MemberSchema,
+    model=Member,
+    columns=(
+        "first_name", "last_name", "contact_email",
+        "phone_number", "member_type", "registration_date"
+    ),
+    unique_keys=(("contact_email",), ("phone_number",))
+)
+
+BOOK_BY_ISBN = NaturalKey("book_id", Book, ("isbn",), ("isbn",))
+MEMBER_BY_EMAIL = NaturalKey("member_id", Member, ("contact_email",), ("member_email",))
+
+BOOK_AUTHORS = TableSpec(
+    label="Book Authors",
+    schema=BookAuthorSchema,
+    model=BookAuthor,
+    columns=("book_id", "author_id"),
+    unique_keys=(("book_id", "author_id"),),
+    lookups=(
+        BOOK_BY_ISBN,
+        NaturalKey(
+            "author_id", Author,
+            ("first_name", "last_name", "birth_date"),
+            ("author_first_name", "author_last_name", "author_birth_date")
+        ),
+    )
+)
+
+BOOK_CATEGORIES = TableSpec(
+    label="Book Categories",
+    schema=BookCategorySchema,
+    model=BookCategory,
+    columns=("book_id", "category_id"),
+    unique_keys=(("book_id", "category_id"),),
+    lookups=(
+        BOOK_BY_ISBN,
+        NaturalKey("category_id", Category, ("name",), ("category_name",)),
+    )
+)
+
+BORROWINGS = TableSpec(
+    label="Borrowings",
+    schema=BorrowingSchema,
+    model=Borrowing,
+    columns=(
+        "member_id", "book_id", "borrow_date",
+        "due_date", "return_date", "late_fee"
+    ),
+    # Not a database constraint: the same member borrowing the same book
+    # on the same day is taken to be a re-imported history row
+    unique_keys=(("member_id", "book_id", "borrow_date"),),
+    lookups=(MEMBER_BY_EMAIL, BOOK_BY_ISBN)
+)
+
+REVIEWS = TableSpec(
+    label="Reviews",
+    schema=ReviewSchema,
+    model=Review,
+    columns=("member_id", "book_id", "rating", "comment", "review_date"),
+    unique_keys=(("member_id", "book_id"),),
+    lookups=(MEMBER_BY_EMAIL, BOOK_BY_ISBN)
+)
+
+
+# ==========================================================
+# Unique Key Index
+# ==========================================================
+
+class UniqueKeyIndex:
+    """
+    Hash sets of every unique key already stored in a table, loaded with
+    a single SELECT. Keys of rows accepted earlier in the same file are
+    added as they are claimed, so duplicates are rejected without a
+    database round trip.
+    """
+
+    def __init__(self, spec: TableSpec):
+        self.spec = spec
+        self.keys = [set() for _ in spec.unique_keys]
+
+    @classmethod
+    def load(cls, session, spec: TableSpec):
+        index = cls(spec)
+
+        key_columns = []
+        for key in spec.unique_keys:
+            for column in key:
+                if column not in key_columns:
+                    key_columns.append(column)
+
+        if key_columns:
+            table = spec.model.__table__
+            result = session.execute(select(*(table.c[c] for c in key_columns)))
+            for row in result.mappings():
+                index._add(row)
+
+        logger.debug(
+            f"{spec.label}: Loaded {sum(len(k) for k in index.keys)} "
+            f"existing unique keys."
+        )
+        return index
 
-            # Ensure referenced library exists
-            library = session.query(Library).filter_by(
-                library_id=validated.library_id
-            ).first()
+    def _candidates(self, values):
+        return [tuple(values[c] for c in key) for key in self.spec.unique_keys]
 
-            if not library:
+    def _add(self, values):
+        for seen, candidate in zip(self.keys, self._candidates(values)):
+            seen.add(candidate)
+
+    def exists(self, values) -> bool:
+        """True if the row's natural key is already stored or claimed."""
+        return tuple(values[c] for c in self.spec.natural_key) in self.keys[0]
+
+    def claim(self, values) -> bool:
+        """Record the row's keys; False if any of them is already taken."""
+        candidates = self._candidates(values)
+
+        for seen, candidate in zip(self.keys, candidates):
+            if candidate in seen:
+                return False
+
+        for seen, candidate in zip(self.keys, candidates):
+            seen.add(candidate)
+        return True
+
+
+# ==========================================================
+# Foreign Key Resolver
+# ==========================================================
+
+class ForeignKeyResolver:
+    """
+    Cached sets of the primary keys present in referenced tables
+    (libraries, members, books, ...). Each set is loaded with one SELECT
+    on first use and dropped with `invalidate` once its table has been
+    loaded, so later tables see the new rows. Natural keys are resolved
+    to primary keys with one SELECT per batch, and the matches are kept
+    for later batches.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._ids = {}
+        self._natural_ids = {}
+
+    def valid_ids(self, model) -> set:
+        if model not in self._ids:
+            primary_key = model.__table__.primary_key.columns[0]
+            self._ids[model] = set(self.session.execute(select(primary_key)).scalars())
+            logger.debug(
+                f"Loaded {len(self._ids[model])} {model.__tablename__} keys "
+                f"for reference checks."
+            )
+        return self._ids[model]
+
+    def invalidate(self, model):
+        self._ids.pop(model, None)
+
+    def lookup_ids(self, lookup: NaturalKey, keys: set) -> dict:
+        """Map natural keys to primary keys, querying only uncached keys."""
+        found = self._natural_ids.setdefault((lookup.model, lookup.key), {})
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            return found
+
+        table = lookup.model.__table__
+        primary_key = table.primary_key.columns[0]
+        key_columns = [table.c[column] for column in lookup.key]
+
+        # Row-value IN cannot match NULLs, so those keys are spelled out
+        complete = [key for key in missing if None not in key]
+        partial_keys = [key for key in missing if None in key]
+        conditions = []
+        if complete:
+            if len(key_columns) == 1:
+                conditions.append(key_columns[0].in_([key[0] for key in complete]))
+            else:
+                conditions.append(tuple_(*key_columns).in_(complete))
+        for key in partial_keys:
+            conditions.append(and_(*(
+                column.is_(None) if value is None else column == value
+                for column, value in zip(key_columns, key)
+            )))
+
+        result = self.session.execute(
+            select(primary_key, *key_columns).where(or_(*conditions))
+        )
+        for row in result:
+            found[tuple(row[1:])] = row[0]
+        return found
+
+    def resolve(self, lookup: NaturalKey, chunk: list) -> list:
+        """
+        Replace the lookup's fields with the resolved ID in a chunk of
+        (row_number, row, values, error) results. Unknown keys become
+        errors.
+        """
+        keys = {
+            tuple(values[field] for field in lookup.fields)
+            for _, _, values, error in chunk if error is None
+        }
+        found = self.lookup_ids(lookup, keys) if keys else {}
+
+        resolved = []
+        for row_number, row, values, error in chunk:
+            if error is None:
+                key = tuple(values.pop(field) for field in lookup.fields)
+                if key in found:
+                    values[lookup.column] = found[key]
+                else:
+                    named = ", ".join(f"{c}={v}" for c, v in zip(lookup.key, key))
+                    error = f"{lookup.model.__name__} with {named} not found."
+            resolved.append((row_number, row, values, error))
+        return resolved
+
+    def check(self, spec: TableSpec, values: dict):
+        for column, model in spec.references:
+            if values[column] not in self.valid_ids(model):
                 raise ValueError(
-                    f"Library with ID {validated.library_id} not found."
+                    f"{model.__name__} with ID {values[column]} not found."
                 )
 
-            with session.begin_nested():
 
-                book = Book(
-                    title=validated.title,
-                    isbn=validated.isbn,
-                    publication_date=validated.publication_date,
-                    total_copies=validated.total_copies,
-                    available_copies=validated.available_copies,
-                    library_id=validated.library_id
-                )
+# ==========================================================
+# Row Fingerprints
+# ==========================================================
 
-                session.add(book)
-                session.flush()
+class FingerprintStore:
+    """
+    SHA-256 of each normalized row, keyed by table and natural key and
+    kept in ingest_fingerprint. Loaded once per table so unchanged rows
+    are skipped before any write and changed rows go to the update path.
+    """
+
+    def __init__(self, spec: TableSpec, stored: dict):
+        self.spec = spec
+        self.table_name = spec.model.__tablename__
+        self.stored = stored
+
+    @classmethod
+    def load(cls, session, spec: TableSpec):
+        IngestFingerprint.__table__.create(session.connection(), checkfirst=True)
+
+        result = session.execute(
+            select(IngestFingerprint.natural_key, IngestFingerprint.fingerprint)
+            .where(IngestFingerprint.table_name == spec.model.__tablename__)
+        )
+        store = cls(spec, {key: digest for key, digest in result})
+
+        logger.debug(f"{spec.label}: Loaded {len(store.stored)} row fingerprints.")
+        return store
+
+    def identify(self, values: dict) -> tuple:
+        key = json.dumps([values[c] for c in self.spec.natural_key], default=str)
+        payload = json.dumps([values[c] for c in self.spec.columns], default=str)
+        return key, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def save(self, session, written: list):
+        """Record fingerprints for (row_number, values) pairs just written."""
+        new, changed = [], []
+
+        for _, values in written:
+            key, digest = self.identify(values)
+            params = {
+                "table_name": self.table_name,
+                "natural_key": key,
+                "fingerprint": digest
+            }
+            (changed if key in self.stored else new).append(params)
+            self.stored[key] = digest
+
+        if new:
+            session.execute(insert(IngestFingerprint), new)
+        if changed:
+            # Bulk UPDATE by primary key
+            session.execute(update(IngestFingerprint), changed)
 
-            logger.info(f"Books: Row {row_number - 1} inserted.")
 
-        except IntegrityError:
-            logger.warning(f"Books: Row {row_number - 1} duplicate.")
-        except Exception as e:
-            logger.error(f"Books: Row {row_number - 1} error:\n{e}")
+# ==========================================================
+# Validation
+# ==========================================================
 
+VALIDATION_CHUNK_ROWS = 1000
 
-def process_members(session, file_path: str):
-    for row_number, row in stream_csv(file_path):
 
-        logger.debug(f"Members: Processing row {row_number - 1}: {row}")
+def _validate_chunk(schema, columns: tuple, chunk: list) -> list:
+    """Run the pydantic schema over a chunk of rows; safe to run in a worker process."""
+    results = []
+    for row_number, row in chunk:
+        try:
+            if isinstance(row, ColumnCheckError):
+                raise row
+            if isinstance(row, CheckedRow):
+                results.append((row_number, row, dict(row), None))
+                continue
+            values = schema(**row).model_dump(include=set(columns))
+            results.append((row_number, row, values, None))
+        except Exception as e:
+            results.append((row_number, row, None, str(e)))
+    return results
+
+
+def _validate_chunk_in_worker(schema, columns: tuple, chunk: list) -> tuple:
+    """
+    _validate_chunk for a process pool worker. Also returns the date
+    format and normalizer cache counters the chunk added, which would
+    otherwise stay in the worker.
+    """
+    before = validation_counters()
+    results = _validate_chunk(schema, columns, chunk)
+    return results, validation_counters() - before
+
+
+def _chunked(rows, size: int):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _schema_results(rows, spec: TableSpec, workers: int = 1, cache_size: Optional[int] = None):
+    """
+    Yield (row_number, row, values, error) for every row, in source
+    order. With more than one worker, chunks of rows are validated in a
+    process pool while the caller keeps writing earlier results.
+    """
+    if workers <= 1:
+        for row_number, row in rows:
+            yield from _validate_chunk(spec.schema, spec.fields, [(row_number, row)])
+        return
+
+    validate = partial(_validate_chunk_in_worker, spec.schema, spec.fields)
+
+    def collect(future):
+        results, counters = future.result()
+        merge_validation_counters(counters)
+        return results
+
+    initializer, initargs = None, ()
+    if cache_size is not None:
+        initializer, initargs = configure_normalizer_cache, (cache_size,)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+
+        for chunk in _chunked(rows, VALIDATION_CHUNK_ROWS):
+            pending.append(pool.submit(validate, chunk))
+
+            # Bound the rows held in memory while the writer catches up
+            if len(pending) >= workers * 2:
+                yield from collect(pending.popleft())
+
+        while pending:
+            yield from collect(pending.popleft())
+
+
+def _resolve_natural_keys(results, spec: TableSpec, resolver: ForeignKeyResolver):
+    """Resolve each chunk's natural keys with one lookup per parent table."""
+    for chunk in _chunked(results, VALIDATION_CHUNK_ROWS):
+        for lookup in spec.lookups:
+            chunk = resolver.resolve(lookup, chunk)
+        yield from chunk
+
+
+def validate_rows(
+    rows,
+    spec: TableSpec,
+    index: Optional[UniqueKeyIndex] = None,
+    resolver: Optional[ForeignKeyResolver] = None,
+    workers: int = 1,
+    cache_size: Optional[int] = None,
+    stats: Optional[TableStats] = None,
+    delta: Optional[FingerprintStore] = None,
+    update_existing: bool = False
+):
+    """
+    Validate (row_number, row) pairs against the table schema and yield
+    (row_number, values, action) for the rows that pass, where action is
+    "insert" or "update". Rows whose natural key is already stored are
+    updates with `update_existing`, or with a FingerprintStore when
+    their fingerprint changed. Rejected rows are logged and counted here
+    so every loader reports them the same way. Specs with natural-key
+    lookups need a resolver.
+    """
+    stats = stats or TableStats(spec.label)
+    results = _schema_results(stats.timed_iter("parse", rows), spec, workers, cache_size)
+    if spec.lookups:
+        results = _resolve_natural_keys(results, spec, resolver)
+    results = stats.timed_iter("validate", results, exclude="parse")
+    # Natural keys seen in this run, when rows may update stored ones
+    seen = set()
+    # Checked once; formatting every row for a disabled level is not free
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    for row_number, row, values, error in results:
+
+        if debug:
+            logger.debug(f"{spec.label}: Processing row {row_number - 1}: {row}")
 
         try:
-            validated = MemberSchema(**row)
+            if error is not None:
+                raise ValueError(error)
+
+            if resolver is not None:
+                resolver.check(spec, values)
+
+            action = "insert"
+            if delta is not None or update_existing:
+                key = tuple(values[column] for column in spec.natural_key)
+                if key in seen:
+                    raise DuplicateRowError()
+                seen.add(key)
+
+                if index is not None and index.exists(values):
+                    if delta is not None:
+                        stored_key, digest = delta.identify(values)
+                        if delta.stored.get(stored_key) == digest:
+                            stats.count("unchanged")
+                            continue
+                    action = "update"
+
+            if action == "insert" and index is not None and not index.claim(values):
+                raise DuplicateRowError()
+
+        except DuplicateRowError:
+            stats.count("duplicate")
+            logger.warning(f"{spec.label}: Row {row_number - 1} duplicate.")
+            continue
+        except Exception as e:
+            stats.count("rejected")
+            logger.error(f"{spec.label}: Row {row_number - 1} error:\n{e}")
+            continue
 
-            with session.begin_nested():
+        yield row_number, values, action
 
-                member = Member(
-                    first_name=validated.first_name,
-                    last_name=validated.last_name,
-                    contact_email=validated.contact_email,
-                    phone_number=validated.phone_number,
-                    member_type=validated.member_type,
-                    registration_date=validated.registration_date
-                )
 
-                session.add(member)
-                session.flush()
+# ==========================================================
+# ORM Loader
+# ==========================================================
+
+def _load_table(session, rows, spec: TableSpec, options: IngestOptions, stats: TableStats, index=None, resolver=None, progress=None, delta=None, upsert_rows=False):
+    """
+    Write validated rows in batches of `options.batch_size`. A batch
+    size of 1 keeps the row-by-row behaviour.
+    """
+    batch_size = max(options.batch_size, 1)
+    inserts, updates = [], []
+    uncommitted = 0
+    # Without a key index, stored keys are left to ON CONFLICT
+    ignore_conflicts = index is None and spec.unique_keys != ()
 
-            logger.info(f"Members: Row {row_number - 1} inserted.")
+    def flush():
+        nonlocal inserts, updates, uncommitted
+        with stats.timed("write"):
+            written = _write_changes(session, spec, stats, inserts, updates, upsert_rows, ignore_conflicts)
+            if delta is not None:
+                delta.save(session, written)
 
+            uncommitted += len(inserts) + len(updates)
+            last_row = max(batch[-1][0] for batch in (inserts, updates) if batch)
 
-        except IntegrityError as e:
-            logger.warning(f"Members: Row {row_number - 1} duplicate.")
-        except Exception as e:
-            logger.error(f"Members: Row {row_number - 1} error:\n{e}")
+            if progress is not None and options.commit_every and uncommitted >= options.commit_every:
+                progress.commit(session, last_row)
+                uncommitted = 0
+
+        stats.sample_memory()
+        inserts, updates = [], []
+
+    for row_number, values, action in validate_rows(
+        rows, spec, index, resolver, options.workers, options.normalizer_cache_size,
+        stats, delta, options.on_conflict == "update"
+    ):
+        (updates if action == "update" else inserts).append((row_number, values))
+
+        if len(inserts) + len(updates) >= batch_size:
+            flush()
+
+    if inserts or updates:
+        flush()
+
+
+# ==========================================================
+# COPY Loader (PostgreSQL)
+# ==========================================================
+
+COPY_CHUNK_ROWS = 50_000
+
+
+def _copy_from_buffer(cursor, sql: str, buffer: io.StringIO):
+    buffer.seek(0)
+    if hasattr(cursor, "copy_expert"):
+        # psycopg2
+        cursor.copy_expert(sql, buffer)
+    else:
+        # psycopg 3
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def _key_match(key: tuple, left: str, right: str, model) -> str:
+    conditions = []
+    for column in key:
+        if model.__table__.c[column].nullable:
+            conditions.append(f"{left}.{column} IS NOT DISTINCT FROM {right}.{column}")
+        else:
+            conditions.append(f"{left}.{column} = {right}.{column}")
+    return " AND ".join(conditions)
+
+
+def _report_rows(session, sql: str, message: str, label: str, level=logging.WARNING) -> list:
+    row_numbers = []
+    for (row_number,) in session.execute(text(sql)):
+        logger.log(level, f"{label}: Row {row_number - 1} {message}")
+        row_numbers.append(row_number)
+    return row_numbers
+
+
+def _live_rules(session, spec: TableSpec) -> tuple:
+    """
+    Length limits and CHECK constraints declared on the live table,
+    restricted to the loaded columns: ({column: max length},
+    [(constraint name, expression)]).
+    """
+    table = spec.model.__tablename__
+
+    lengths = dict(session.execute(text(
+        "SELECT column_name, character_maximum_length FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = :table "
+        "AND character_maximum_length IS NOT NULL"
+    ), {"table": table}).all())
+
+    checks = []
+    for name, expression, columns in session.execute(text(
+        "SELECT c.conname, pg_get_expr(c.conbin, c.conrelid), "
+        "ARRAY(SELECT a.attname FROM pg_attribute a "
+        "WHERE a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)) "
+        "FROM pg_constraint c "
+        "WHERE c.conrelid = CAST(:table AS regclass) AND c.contype = 'c' "
+        "ORDER BY c.conname"
+    ), {"table": table}):
+        # Constraints on columns the load leaves to their defaults cannot be checked in staging
+        if set(columns) <= set(spec.columns):
+            checks.append((name, expression))
+
+    return {column: length for column, length in lengths.items() if column in spec.columns}, checks
+
+
+def _copy_merge(session, spec: TableSpec, buffer: io.StringIO, staged: int) -> tuple:
+    """
+    COPY one chunk of rows into a temporary staging table, then merge it
+    into the target table with set-based statements. Rows that are too
+    long for a column, fail a CHECK constraint, or clash with data
+    written since the unique key index was loaded are removed from the
+    staging table first so they can still be reported per row.
+    Returns (inserted, duplicates, rejected, row numbers removed from the
+    staging table).
+    """
+    model = spec.model
+    table = model.__tablename__
+    stage = f"stage_{table}"
+    columns = ", ".join(spec.columns)
+    lengths, checks = _live_rules(session, spec)
+
+    # Mirror the live column types rather than the ORM declarations,
+    # widening length-limited columns to TEXT so over-long values reach
+    # the staging table and can be rejected per row
+    staged_columns = ", ".join(
+        f"{column}::text AS {column}" if column in lengths else column
+        for column in spec.columns
+    )
+    session.execute(text(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT 0 AS row_number, {staged_columns} FROM {table} WITH NO DATA"
+    ))
+
+    cursor = session.connection().connection.cursor()
+    _copy_from_buffer(
+        cursor,
+        f"COPY {stage} (row_number, {columns}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+    for position, key in enumerate(spec.unique_keys):
+        session.execute(text(
+            f"CREATE INDEX {stage}_key_{position} ON {stage} ({', '.join(key)})"
+        ))
+    session.execute(text(f"ANALYZE {stage}"))
+
+    # References removed since the resolver loaded its keys
+    rejected = []
+    for column, referenced in spec.parents:
+        ref_table = referenced.__tablename__
+        ref_key = referenced.__table__.primary_key.columns[0].name
+        rejected += _report_rows(
+            session,
+            f"DELETE FROM {stage} s WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {ref_table} r WHERE r.{ref_key} = s.{column}) "
+            f"RETURNING s.row_number",
+            f"error:\n{referenced.__name__} referenced by {column} not found.",
+            spec.label,
+            level=logging.ERROR
+        )
+
+    # Values the target columns would refuse
+    for column, length in lengths.items():
+        rejected += _report_rows(
+            session,
+            f"DELETE FROM {stage} s WHERE length(s.{column}) > {length} "
+            f"RETURNING s.row_number",
+            f"error:\n{column} is longer than {length} characters.",
+            spec.label,
+            level=logging.ERROR
+        )
+    for name, expression in checks:
+        rejected += _report_rows(
+            session,
+            f"DELETE FROM {stage} s WHERE NOT ({expression}) "
+            f"RETURNING s.row_number",
+            f"error:\nviolates check constraint {name}.",
+            spec.label,
+            level=logging.ERROR
+        )
+
+    duplicates = []
+    for key in spec.unique_keys:
+        # Rows already present in the target table
+        duplicates += _report_rows(
+            session,
+            f"DELETE FROM {stage} s WHERE EXISTS "
+            f"(SELECT 1 FROM {table} t WHERE {_key_match(key, 't', 's', model)}) "
+            f"RETURNING s.row_number",
+            "duplicate.",
+            spec.label
+        )
+        # Rows repeated earlier in the same chunk
+        duplicates += _report_rows(
+            session,
+            f"DELETE FROM {stage} s WHERE EXISTS "
+            f"(SELECT 1 FROM {stage} t WHERE {_key_match(key, 't', 's', model)} "
+            f"AND t.row_number < s.row_number) "
+            f"RETURNING s.row_number",
+            "duplicate.",
+            spec.label
+        )
+
+    result = session.execute(text(
+        f"INSERT INTO {table} ({columns}) "
+        f"SELECT {columns} FROM {stage} ORDER BY row_number "
+        f"ON CONFLICT DO NOTHING"
+    ))
+    inserted = result.rowcount
+
+    session.execute(text(f"DROP TABLE {stage}"))
+
+    removed = set(duplicates) | set(rejected)
+    # Rows lost to a concurrent writer between the checks and the merge
+    # cannot be identified, only counted
+    lost = staged - len(removed) - inserted
+
+    return inserted, len(duplicates) + lost, len(rejected), removed
+
+
+def _copy_load_table(session, rows, spec: TableSpec, options: IngestOptions, stats: TableStats, index=None, resolver=None, progress=None, delta=None, upsert_rows=False):
+    """
+    Stream validated rows over COPY FROM STDIN in chunks of
+    COPY_CHUNK_ROWS (or `options.commit_every`), merging each chunk
+    before the next one is staged. Rows routed to the update path are
+    written with batched UPDATEs (or upserts) at each merge.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        raise ValueError("The COPY loader requires a PostgreSQL database.")
+
+    chunk_rows = options.commit_every or COPY_CHUNK_ROWS
+    staged = 0
+    last_row = None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Kept only to fingerprint the rows that survive the merge
+    staged_rows, updates = [], []
+
+    def merge():
+        nonlocal staged, buffer, writer, staged_rows, updates
+        with stats.timed("write"):
+            written = []
+            if staged:
+                inserted, duplicates, rejected, removed = _copy_merge(session, spec, buffer, staged)
+                stats.count("inserted", inserted)
+                stats.count("duplicate", duplicates)
+                stats.count("rejected", rejected)
+                written += [row for row in staged_rows if row[0] not in removed]
+
+            if updates:
+                written += _write_changes(session, spec, stats, [], updates, upsert_rows)
+            if delta is not None:
+                delta.save(session, written)
+
+            if progress is not None and options.commit_every:
+                progress.commit(session, last_row)
+
+        stats.sample_memory()
+        staged = 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        staged_rows, updates = [], []
+
+    for row_number, values, action in validate_rows(
+        rows, spec, index, resolver, options.workers, options.normalizer_cache_size,
+        stats, delta, options.on_conflict == "update"
+    ):
+        last_row = row_number
+
+        if action == "update":
+            updates.append((row_number, values))
+        else:
+            with stats.timed("write"):
+                writer.writerow([row_number] + [values[column] for column in spec.columns])
+            staged += 1
+            if delta is not None:
+                staged_rows.append((row_number, values))
+
+        if staged + len(updates) >= chunk_rows:
+            merge()
+
+    if staged or updates:
+        merge()
+
+
+# ==========================================================
+# Processing Functions
+# ==========================================================
+
+def _needs_key_index(session, spec: TableSpec, options: IngestOptions) -> bool:
+    """
+    Whether the table's stored keys must be held in a UniqueKeyIndex.
+    Updates and incremental loads look existing rows up in it. Otherwise,
+    with `options.unique_index` off, the COPY loader's staging passes
+    find stored keys in the database, and the ORM loader can leave them
+    to ON CONFLICT when unique constraints on NOT NULL columns cover
+    every key (NULLs never collide in a unique constraint).
+    """
+    if options.unique_index or options.incremental or options.on_conflict == "update":
+        return True
+    if options.loader == "copy":
+        return False
+
+    table = spec.model.__table__
+    connection = session.connection()
+    return not all(
+        has_unique_key(connection, spec.model, key)
+        and not any(table.c[column].nullable for column in key)
+        for key in spec.unique_keys
+    )
+
+
+def process_table(
+    session,
+    file_path: str,
+    spec: TableSpec,
+    options: Optional[IngestOptions] = None,
+    resolver: Optional[ForeignKeyResolver] = None,
+    checkpoint: Optional[Checkpoint] = None,
+    metrics: Optional[RunMetrics] = None
+):
+    options = options or IngestOptions()
+    resolver = resolver or ForeignKeyResolver(session)
+    metrics = metrics or RunMetrics()
+    file_name = os.path.basename(file_path)
+
+    progress = None
+    start = None
+    if checkpoint is not None:
+        if checkpoint.is_complete(file_name):
+            logger.info(f"{spec.label}: {file_name} already committed, skipping.")
+            return
+
+        start = checkpoint.position(file_name)
+        if start is not None:
+            logger.info(f"{spec.label}: Resuming {file_name} after row {start[0] - 1}.")
+        progress = FileProgress(checkpoint, file_name, start)
+
+    stats = metrics.table(spec.label)
+    stats.sample_memory()
+    index = UniqueKeyIndex.load(session, spec) if _needs_key_index(session, spec, options) else None
+    delta = FingerprintStore.load(session, spec) if options.incremental else None
+    # Positions are only needed to checkpoint mid-file; a complete file is skipped on resume
+    positions = progress.positions if progress and options.commit_every else None
+    rows = stream_input(file_path, spec, start, positions)
+
+    upsert_rows = False
+    if options.on_conflict == "update":
+        upsert_rows = has_unique_key(session.connection(), spec.model, spec.natural_key)
+        if not upsert_rows:
+            logger.warning(
+                f"{spec.label}: No unique constraint on ({', '.join(spec.natural_key)}); "
+                f"updating existing rows by key instead of ON CONFLICT."
+            )
+
+    if options.loader == "copy":
+        _copy_load_table(session, rows, spec, options, stats, index, resolver, progress, delta, upsert_rows)
+    else:
+        _load_table(session, rows, spec, options, stats, index, resolver, progress, delta, upsert_rows)
+
+    if progress is not None:
+        with stats.timed("write"):
+            progress.commit(session, complete=True)
+    stats.sample_memory()
+
+    counts = stats.counts
+    logger.info(
+        f"{spec.label}: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged, {counts['duplicate']} duplicates, "
+        f"{counts['rejected']} rejected (peak RSS {stats.peak_rss / 2**20:.1f} MB)."
+    )
+
+    # Rows referencing this table must see what was just loaded
+    resolver.invalidate(spec.model)
+
+
+def process_libraries(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, LIBRARIES, options, resolver, checkpoint, metrics)
+
+
+def process_authors(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, AUTHORS, options, resolver, checkpoint, metrics)
+
+
+def process_books(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, BOOKS, options, resolver, checkpoint, metrics)
+
+
+def process_members(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, MEMBERS, options, resolver, checkpoint, metrics)
+
+
+def process_book_authors(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, BOOK_AUTHORS, options, resolver, checkpoint, metrics)
+
+
+def process_book_categories(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, BOOK_CATEGORIES, options, resolver, checkpoint, metrics)
+
+
+def process_borrowings(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, BORROWINGS, options, resolver, checkpoint, metrics)
+
+
+def process_reviews(session, file_path: str, options=None, resolver=None, checkpoint=None, metrics=None):
+    process_table(session, file_path, REVIEWS, options, resolver, checkpoint, metrics)
 
 
 # ==========================================================
 # Master Orchestrator
 # ==========================================================
 
-def ingest_from_directory(directory_path: str, Session):
+# Input file stems in the order a serial run loads them; each may be
+# any of INPUT_SUFFIXES
+TABLE_FILES = (
+    (LIBRARIES, "libraries"),
+    (AUTHORS, "authors"),
+    (BOOKS, "books"),
+    (MEMBERS, "members"),
+)
 
-    libraries_path = os.path.join(directory_path, "libraries.csv")
-    authors_path = os.path.join(directory_path, "authors.csv")
-    books_path = os.path.join(directory_path, "books.csv")
-    members_path = os.path.join(directory_path, "members.csv")
+# Junction and history tables, loaded only when their file is present
+OPTIONAL_TABLE_FILES = (
+    (BOOK_AUTHORS, "book_authors"),
+    (BOOK_CATEGORIES, "book_categories"),
+    (BORROWINGS, "borrowings"),
+    (REVIEWS, "reviews"),
+)
 
-    required_files = [
-        libraries_path,
-        authors_path,
-        books_path,
-        members_path
-    ]
 
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Missing required file: {file_path}")
+def table_dependencies(specs) -> dict:
+    """Map each TableSpec to the specs whose tables it references."""
+    by_model = {spec.model: spec for spec in specs}
+    return {
+        spec: {by_model[model] for _, model in spec.parents if model in by_model}
+        for spec in specs
+    }
 
+
+def _process_in_own_session(Session, file_path: str, spec: TableSpec, options, checkpoint, metrics):
     with session_scope(Session) as session:
-        logger.info("Starting ingestion process...")
-        process_libraries(session, libraries_path)
-        process_authors(session, authors_path)
-        process_books(session, books_path)
-        process_members(session, members_path)
-        logger.info("Ingestion completed successfully.")
+        process_table(
+            session, file_path, spec, options,
+            ForeignKeyResolver(session), checkpoint, metrics
+        )
+
+
+def _ingest_parallel(paths: dict, Session, options, checkpoint, metrics):
+    """
+    Load tables concurrently, each in its own session and transaction.
+    A table starts as soon as every table it references has committed,
+    so the run takes about as long as the longest dependency chain.
+    """
+    waiting = table_dependencies(list(paths))
+    done = set()
+    running = {}
+    failure = None
+
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        while waiting or running:
+            if failure is None:
+                for spec in [s for s, deps in waiting.items() if deps <= done]:
+                    del waiting[spec]
+                    logger.info(f"{spec.label}: Starting load.")
+                    future = pool.submit(
+                        _process_in_own_session,
+                        Session, paths[spec], spec, options, checkpoint, metrics
+                    )
+                    running[future] = spec
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                spec = running.pop(future)
+                try:
+                    future.result()
+                    done.add(spec)
+                except Exception as e:
+                    logger.error(f"{spec.label}: Load failed: {e}")
+                    failure = failure or e
+
+    if failure is not None:
+        raise failure
+
+
+def ingest_from_directory(
+    directory_path: str,
+    Session,
+    options: Optional[IngestOptions] = None,
+    metrics: Optional[RunMetrics] = None
+):
+
+    paths = {}
+    for spec, stem in TABLE_FILES:
+        file_path = find_input(directory_path, stem)
+        if file_path is None:
+            raise FileNotFoundError(
+                f"Missing required file: {os.path.join(directory_path, stem)}.csv "
+                f"(or {', '.join(INPUT_SUFFIXES[1:])})"
+            )
+        paths[spec] = file_path
+
+    for spec, stem in OPTIONAL_TABLE_FILES:
+        file_path = find_input(directory_path, stem)
+        if file_path is not None:
+            paths[spec] = file_path
+
+    options = options or IngestOptions()
+
+    checkpoint = None
+    if options.commit_every or options.resume:
+        checkpoint_path = os.path.join(directory_path, CHECKPOINT_FILE)
+        if options.resume:
+            checkpoint = Checkpoint.load(checkpoint_path)
+        else:
+            checkpoint = Checkpoint(checkpoint_path)
+
+    metrics = metrics or RunMetrics()
+
+    if options.incremental:
+        # Created up front so parallel table loads do not race to create it
+        with session_scope(Session) as session:
+            IngestFingerprint.__table__.create(session.connection(), checkfirst=True)
+
+    logger.info("Starting ingestion process...")
+
+    if options.parallel_tables:
+        _ingest_parallel(paths, Session, options, checkpoint, metrics)
+    else:
+        with session_scope(Session) as session:
+            resolver = ForeignKeyResolver(session)
+            for spec, file_path in paths.items():
+                process_table(session, file_path, spec, options, resolver, checkpoint, metrics)
+
+    logger.info("Ingestion completed successfully.")
+
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    return metrics
 
 # ==========================================================
 # Entry Point
@@ -286,7 +2037,7 @@ def parse_arguments():
     parser.add_argument(
         "-d", "--directory",
         required=True,
-        help="Path to directory containing CSV files"
+        help="Path to directory containing CSV (.csv, .csv.gz, .csv.zst) or Parquet files"
     )
 
     parser.add_argument(
@@ -304,6 +2055,78 @@ def parse_arguments():
         help="Logging level (default: INFO)"
     )
 
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Rows per multi-row INSERT; 1 inserts row by row (default: 1)"
+    )
+
+    parser.add_argument(
+        "--loader",
+        default="orm",
+        choices=["orm", "copy"],
+        help="Write path: ORM inserts or PostgreSQL COPY into staging tables (default: orm)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to validate rows; 1 validates inline (default: 1)"
+    )
+
+    parser.add_argument(
+        "--normalizer-cache-size",
+        type=int,
+        default=None,
+        help="Entries kept per normalizer LRU cache; 0 disables caching"
+    )
+
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        default=0,
+        help=(
+            "Commit, checkpoint and release session memory every N rows; "
+            "0 uses one transaction (default: 0)"
+        )
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the checkpoint left by an interrupted run"
+    )
+
+    parser.add_argument(
+        "--parallel-tables",
+        action="store_true",
+        help="Load independent tables concurrently, each in its own transaction"
+    )
+
+    parser.add_argument(
+        "--on-conflict",
+        default="ignore",
+        choices=["ignore", "update"],
+        help=(
+            "Rows whose natural key (ISBN, email, author identity) already exists: "
+            "report as duplicates or update changed columns (default: ignore)"
+        )
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip rows unchanged since the last run and update changed ones"
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Also write the JSON run summary to this path"
+    )
+
     return parser.parse_args()
 
 if __name__ == "__main__":
@@ -312,4 +2135,20 @@ if __name__ == "__main__":
     logger = logging.getLogger(__name__)
     Session = create_session_factory(args.database_url)
 
-    ingest_from_directory(args.directory, Session)
+    options = IngestOptions(
+        batch_size=args.batch_size,
+        loader=args.loader,
+        workers=args.workers,
+        commit_every=args.commit_every,
+        resume=args.resume,
+        parallel_tables=args.parallel_tables,
+        incremental=args.incremental,
+        on_conflict=args.on_conflict,
+        normalizer_cache_size=args.normalizer_cache_size
+    )
+
+    if options.normalizer_cache_size is not None:
+        configure_normalizer_cache(options.normalizer_cache_size)
+
+    metrics = ingest_from_directory(args.directory, Session, options)
+    metrics.emit(args.metrics_file)
@@ -0,0 +1,68 @@
+## Imports
+
+
+from sqlalchemy import inspect, or_
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+## Dialect-aware Statements
+
+
+def dialect_insert(bind, model):
+    """INSERT with the dialect's ON CONFLICT clauses (PostgreSQL, SQLite)."""
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise ValueError(f"ON CONFLICT is not supported on {dialect}.")
+
+
+def has_unique_key(bind, model, columns) -> bool:
+    """
+    True if the live table has a primary key, unique constraint or unique
+    index on exactly `columns`, so ON CONFLICT can use it as an arbiter.
+    """
+    inspector = inspect(bind)
+    table_name = model.__tablename__
+
+    candidates = [inspector.get_pk_constraint(table_name)["constrained_columns"]]
+    candidates += [c["column_names"] for c in inspector.get_unique_constraints(table_name)]
+    candidates += [i["column_names"] for i in inspector.get_indexes(table_name) if i["unique"]]
+
+    return any(set(candidate) == set(columns) for candidate in candidates)
+
+
+def insert_ignore(bind, model):
+    """INSERT that skips rows colliding with any unique constraint."""
+    return dialect_insert(bind, model).on_conflict_do_nothing()
+
+
+def upsert(bind, model, key, columns):
+    """
+    INSERT ... ON CONFLICT (key) DO UPDATE that rewrites an existing row
+    only when one of `columns` changed. Tables with no columns outside
+    the key (junction tables) get DO NOTHING instead.
+    """
+    statement = dialect_insert(bind, model)
+    table = model.__table__
+    index_elements = [table.c[column] for column in key]
+
+    values = {
+        column: statement.excluded[column]
+        for column in columns if column not in key
+    }
+    if not values:
+        return statement.on_conflict_do_nothing(index_elements=index_elements)
+
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_=values,
+        where=or_(*(
+            table.c[column].is_distinct_from(value)
+            for column, value in values.items()
+        ))
+    )
+
+
+## End
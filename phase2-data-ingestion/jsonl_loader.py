@@ -0,0 +1,227 @@
+## Imports
+
+
+import os
+import sys
+import json
+import glob
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Book
+from schemas import BookSchema
+from db_utils import insert_ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+## Reading
+
+
+BOOK_COLUMNS = ("title", "isbn", "publication_date", "total_copies", "available_copies", "library_id")
+
+
+def read_books(path: str, stats: Counter):
+    """
+    Yield BookSchema-validated rows from a JSONL file of book records,
+    such as api_fetcher --output-jsonl writes. Repeated ISBNs within
+    the file are skipped. A truncated last line, left by a harvest that
+    was killed mid-write, is rejected like any other malformed line.
+    """
+    seen = set()
+
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                values = BookSchema(**json.loads(line)).model_dump(include=set(BOOK_COLUMNS))
+            except Exception as e:
+                logger.warning(f"{path}:{line_number}: rejected ({e.__class__.__name__}).")
+                stats["rejected"] += 1
+                continue
+
+            if values["isbn"] in seen:
+                stats["duplicate"] += 1
+                continue
+            seen.add(values["isbn"])
+
+            yield values
+
+
+def _batches(rows, size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+## Loading
+
+
+def _insert_batch(session, statement, batch: list, path: str, stats: Counter):
+    """
+    Insert a batch in a savepoint. If the database refuses it (a CHECK
+    constraint, an over-long title, an unknown library), the batch is
+    replayed row by row and only the refused rows are rejected.
+    """
+    try:
+        with session.begin_nested():
+            inserted = len(session.execute(statement, batch).all())
+
+    except Exception as e:
+        if len(batch) > 1:
+            logger.debug(
+                f"{path}: Batch of {len(batch)} rows failed ({e.__class__.__name__}), "
+                f"falling back to row-by-row inserts."
+            )
+            for row in batch:
+                _insert_batch(session, statement, [row], path, stats)
+            return
+
+        logger.warning(f"{path}: ISBN {batch[0]['isbn']} rejected ({e.__class__.__name__}).")
+        stats["rejected"] += 1
+        return
+
+    stats["inserted"] += inserted
+    stats["duplicate"] += len(batch) - inserted
+
+
+def load_file(path: str, Session, batch_size: int = 1000) -> Counter:
+    """
+    Bulk-insert one JSONL file with batched INSERT ... ON CONFLICT DO
+    NOTHING, committing each batch. ISBNs already in `book`, whether
+    from earlier runs or from files loading in parallel, are counted as
+    duplicates, so re-running a partly loaded file is safe. Rows the
+    database refuses are rejected without failing the file.
+    """
+    stats = Counter()
+
+    with Session() as session:
+        statement = insert_ignore(session.get_bind(), Book).returning(Book.isbn)
+
+        for batch in _batches(read_books(path, stats), batch_size):
+            _insert_batch(session, statement, batch, path, stats)
+            session.commit()
+
+    logger.info(
+        f"{os.path.basename(path)}: {stats['inserted']} inserted, "
+        f"{stats['duplicate']} duplicates, {stats['rejected']} rejected."
+    )
+    return stats
+
+
+def expand_paths(paths: list) -> list:
+    """Files from the arguments; directories contribute their *.jsonl files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.jsonl"))))
+        else:
+            files.append(path)
+    return files
+
+
+def load_files(paths: list, Session, batch_size: int = 1000, workers: int = 1) -> tuple:
+    """
+    Load every file, `workers` at a time, each in its own session.
+    A failing file is logged and does not stop the others.
+    Returns (total counts, failed paths).
+    """
+    totals = Counter()
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = {executor.submit(load_file, path, Session, batch_size): path for path in paths}
+
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                totals.update(future.result())
+            except Exception as e:
+                logger.error(f"{path}: load failed: {e}")
+                failed.append(path)
+
+    return totals, failed
+
+
+## Entry Point
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Bulk-load JSONL book files written by api_fetcher --output-jsonl."
+    )
+
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="JSONL files, or directories of *.jsonl files"
+    )
+
+    parser.add_argument(
+        "--db",
+        required=True,
+        help="Database connection URL"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows per INSERT and per commit (default: 1000)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Files loaded at the same time, one connection each (default: 4)"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    logging.basicConfig(
+        filename="jsonl_loader.log",
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        logger.warning("No JSONL files to load.")
+        return 0
+
+    engine = create_engine(args.db, pool_size=max(args.workers, 5), pool_pre_ping=True)
+    Session = sessionmaker(bind=engine)
+
+    logger.info(f"Loading {len(paths)} file(s) with {args.workers} worker(s)...")
+    totals, failed = load_files(paths, Session, args.batch_size, args.workers)
+
+    logger.info(
+        f"Total: {totals['inserted']} inserted, {totals['duplicate']} duplicates, "
+        f"{totals['rejected']} rejected, {len(failed)} file(s) failed."
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+
+## End
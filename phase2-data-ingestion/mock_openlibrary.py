@@ -0,0 +1,294 @@
+## Imports
+
+
+import re
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import isbnlib
+
+from api_client import TokenBucket
+
+
+logger = logging.getLogger(__name__)
+
+
+## Fixtures
+
+
+class SyntheticCatalogue:
+    """
+    Deterministic stand-in for OpenLibrary's data. "Author N" has key
+    OL{N}A and `works` works; every `invalid_every`-th work has no
+    edition with an ISBN, so the fetcher has to skip it. ISBNs are
+    unique across authors.
+    """
+
+    def __init__(self, works: int = 40, invalid_every: int = 4):
+        self.works = works
+        self.invalid_every = invalid_every
+
+    def _author_number(self, author_key: str) -> Optional[int]:
+        match = re.fullmatch(r"OL(\d+)A", author_key)
+        return int(match.group(1)) if match else None
+
+    def _work_number(self, author: int, index: int) -> int:
+        return author * self.works + index
+
+    def _isbn(self, work: int) -> Optional[str]:
+        if self.invalid_every and work % self.invalid_every == 0:
+            return None
+        base = f"978{work:09d}"
+        return base + isbnlib.check_digit13(base)
+
+    def search_authors(self, query: str) -> dict:
+        match = re.search(r"(\d+)", query)
+        if not match:
+            return {"numFound": 0, "docs": []}
+        return {"numFound": 1, "docs": [{"key": f"OL{match.group(1)}A", "name": query}]}
+
+    def author_works(self, author_key: str) -> Optional[dict]:
+        author = self._author_number(author_key)
+        if author is None:
+            return None
+
+        entries = [
+            {"key": f"/works/OL{self._work_number(author, i)}W", "title": f"Work {self._work_number(author, i)}"}
+            for i in range(self.works)
+        ]
+        return {"size": len(entries), "entries": entries}
+
+    def work_editions(self, work: int) -> dict:
+        isbn = self._isbn(work)
+        if isbn is None:
+            return {"size": 1, "entries": [{"title": f"Work {work}", "publish_date": "1990"}]}
+        return {"size": 1, "entries": [{"title": f"Work {work}", "isbn_13": [isbn], "publish_date": "1990"}]}
+
+    def search_works(self, author_key: str, page: int, limit: int) -> Optional[dict]:
+        author = self._author_number(author_key)
+        if author is None:
+            return None
+
+        docs = []
+        for i in range((page - 1) * limit, min(page * limit, self.works)):
+            work = self._work_number(author, i)
+            doc = {"key": f"/works/OL{work}W", "title": f"Work {work}", "first_publish_year": 1990}
+            isbn = self._isbn(work)
+            if isbn:
+                doc["isbn"] = [isbn]
+            docs.append(doc)
+
+        return {"numFound": self.works, "docs": docs}
+
+    def respond(self, path: str) -> Optional[dict]:
+        """Response body for a request path, or None for a 404."""
+        url = urlparse(path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+
+        if url.path == "/search/authors.json":
+            return self.search_authors(query.get("q", ""))
+
+        if url.path == "/search.json":
+            return self.search_works(
+                query.get("author_key", ""),
+                int(query.get("page", 1)),
+                int(query.get("limit", 100))
+            )
+
+        match = re.fullmatch(r"/authors/([^/]+)/works\.json", url.path)
+        if match:
+            return self.author_works(match.group(1))
+
+        match = re.fullmatch(r"/works/OL(\d+)W/editions\.json", url.path)
+        if match:
+            return self.work_editions(int(match.group(1)))
+
+        return None
+
+
+## Server
+
+
+class MockOpenLibrary(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer answering OpenLibrary API paths from recorded
+    fixtures (exact path and query) or the synthetic catalogue.
+    Every response waits `latency` ± `jitter` seconds; beyond
+    `rate_limit` requests per second clients get 429 with Retry-After.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        catalogue: Optional[SyntheticCatalogue] = None,
+        fixtures: Optional[dict] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: Optional[float] = None,
+        retry_after: int = 1
+    ):
+        super().__init__(address, MockRequestHandler)
+        self.catalogue = catalogue or SyntheticCatalogue()
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.retry_after = retry_after
+        # Burst of one second's worth of requests, then `rate_limit` per second
+        self.bucket = TokenBucket(rate_limit, capacity=max(rate_limit, 1)) if rate_limit else None
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, outcome: str):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def throttled(self) -> bool:
+        return self.bucket is not None and not self.bucket.try_acquire()
+
+    def start(self) -> threading.Thread:
+        """Serve from a daemon thread; stop with shutdown()."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; split writes meet delayed
+    # ACKs and add ~40 ms to every keep-alive response
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, status: int, body: Optional[dict] = None, headers: Optional[dict] = None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+
+        if server.throttled():
+            server.count("throttled")
+            self._send(429, {"error": "rate limited"}, {"Retry-After": str(server.retry_after)})
+            return
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = server.fixtures.get(self.path)
+        if body is None:
+            body = server.catalogue.respond(self.path)
+
+        if body is None:
+            server.count("not_found")
+            self._send(404, {"error": "not found"})
+            return
+
+        server.count("ok")
+        self._send(200, body)
+
+
+## Entry Point
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the OpenLibrary API."
+    )
+
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+
+    parser.add_argument(
+        "--fixtures",
+        default=None,
+        help="JSON file mapping request paths (with query) to recorded response bodies"
+    )
+
+    parser.add_argument("--works", type=int, default=40, help="Synthetic works per author (default: 40)")
+
+    parser.add_argument(
+        "--invalid-every",
+        type=int,
+        default=4,
+        help="Every Nth synthetic work has no ISBN; 0 for none (default: 4)"
+    )
+
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to each response (default: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random ± seconds around --latency (default: 0)")
+
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Requests per second served before answering 429 (default: unlimited)"
+    )
+
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=1,
+        help="Retry-After seconds sent with 429 responses (default: 1)"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            fixtures = json.load(f)
+
+    server = MockOpenLibrary(
+        (args.host, args.port),
+        catalogue=SyntheticCatalogue(args.works, args.invalid_every),
+        fixtures=fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after
+    )
+
+    logger.info(f"Serving mock OpenLibrary on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Served: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+## End
@@ -251,4 +251,12 @@ class BookCategory(Base):
     )
 
 
+class IngestFingerprint(Base):
+    __tablename__ = "ingest_fingerprint"
+
+    table_name = Column(String(30), primary_key=True)
+    natural_key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+
+
 ## End
\ No newline at end of file
@@ -0,0 +1,430 @@
+## Imports
+
+
+import os
+import csv
+import gzip
+import json
+import sqlite3
+import logging
+import argparse
+import tempfile
+from collections import Counter
+from dataclasses import replace
+from typing import Optional
+
+from pydantic import ValidationError
+
+from schemas import AuthorSchema, BookSchema, exact_date
+from data_processor import (
+    AUTHORS,
+    BOOKS,
+    BOOK_AUTHORS,
+    ForeignKeyResolver,
+    IngestOptions,
+    RunMetrics,
+    create_session_factory,
+    process_table,
+    session_scope
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+## Dump Reader
+
+
+def read_dump(path: str):
+    """
+    Yield (type, key, record) for each line of an OpenLibrary dump:
+    tab-separated type, key, revision[, last_modified] and the record as
+    JSON in the last column. Gzipped (.gz) and plain files are read as a
+    stream, one line at a time.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            columns = line.rstrip("\n").split("\t")
+            if len(columns) < 4:
+                logger.warning(f"Line {line_number}: expected type, key, revision and JSON columns, skipped.")
+                continue
+
+            try:
+                record = json.loads(columns[-1])
+            except json.JSONDecodeError as e:
+                logger.warning(f"Line {line_number}: invalid JSON ({e}), skipped.")
+                continue
+
+            yield columns[0], columns[1], record
+
+
+def _text(value) -> Optional[str]:
+    # Long text fields come as {"type": "/type/text", "value": "..."}
+    if isinstance(value, dict):
+        return value.get("value")
+    return value
+
+
+def _keys(references, field: Optional[str] = None) -> list:
+    """Keys from [{"key": ...}] or, with `field`, [{field: {"key": ...}}]."""
+    keys = []
+    for reference in references or []:
+        if field is not None:
+            reference = reference.get(field) or {}
+        if reference.get("key"):
+            keys.append(reference["key"])
+    return keys
+
+
+## Record Conversion
+
+
+def _fits(model, values: dict) -> bool:
+    # PostgreSQL rejects strings longer than the column; catch them before the load
+    for column, value in values.items():
+        length = getattr(model.__table__.c[column].type, "length", None)
+        if isinstance(value, str) and length and len(value) > length:
+            return False
+    return True
+
+
+def _validated(schema, row: dict, spec) -> Optional[dict]:
+    try:
+        values = schema(**row).model_dump(include=set(spec.columns))
+    except ValidationError:
+        return None
+    return values if _fits(spec.model, values) else None
+
+
+def author_values(record: dict) -> Optional[dict]:
+    """AuthorSchema-validated author, or None if it cannot be stored."""
+    name = " ".join((record.get("name") or "").split())
+    if " " not in name:
+        # first_name and last_name are both required
+        return None
+
+    first_name, last_name = name.rsplit(" ", 1)
+    row = {
+        "first_name": first_name,
+        "last_name": last_name,
+        # Free-form dates such as "fl. 1850" or "c. 1800" are dropped,
+        # not guessed: the birth date is part of the author's identity
+        "birth_date": exact_date(record.get("birth_date")),
+        "nationality": None,
+        "biography": _text(record.get("bio"))
+    }
+
+    return _validated(AuthorSchema, row, AUTHORS)
+
+
+def book_values(record: dict, library_id: int, copies: int) -> Optional[dict]:
+    """BookSchema-validated book for an edition, or None if it has no usable ISBN, title or date."""
+    isbns = (record.get("isbn_13") or []) + (record.get("isbn_10") or [])
+    title = record.get("title")
+    publish_date = record.get("publish_date")
+
+    if not isbns or not title or not publish_date:
+        return None
+
+    row = {
+        "title": title,
+        "isbn": isbns[0],
+        "publication_date": publish_date,
+        "total_copies": copies,
+        "available_copies": copies,
+        "library_id": library_id
+    }
+    return _validated(BookSchema, row, BOOKS)
+
+
+## Key Map
+
+
+class DumpKeyMap:
+    """
+    On-disk SQLite map from dump keys to what book_author rows need:
+    author keys to author identities, work keys to author keys and
+    ISBNs to work/author keys. The dump is read once and can list
+    editions before the works and authors they point to, so the links
+    are only resolved once the whole dump has been seen.
+    """
+
+    def __init__(self, path: str):
+        # Scratch data, rebuilt on every run
+        if os.path.exists(path):
+            os.remove(path)
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.executescript(
+            "CREATE TABLE author (key TEXT PRIMARY KEY, first_name TEXT, last_name TEXT, birth_date TEXT);"
+            "CREATE TABLE author_identity (first_name TEXT, last_name TEXT, birth_date TEXT, "
+            "PRIMARY KEY (first_name, last_name, birth_date));"
+            "CREATE TABLE edition (isbn TEXT PRIMARY KEY);"
+            "CREATE TABLE work_author (work_key TEXT, author_key TEXT);"
+            "CREATE TABLE edition_work (isbn TEXT, work_key TEXT);"
+            "CREATE TABLE edition_author (isbn TEXT, author_key TEXT);"
+        )
+
+    def add_author(self, key: str, values: dict) -> bool:
+        """Map `key` to the author; False if an author with this identity was already added."""
+        birth_date = values["birth_date"].isoformat() if values["birth_date"] else None
+        identity = (values["first_name"], values["last_name"], birth_date)
+
+        self._connection.execute("INSERT OR REPLACE INTO author VALUES (?, ?, ?, ?)", (key, *identity))
+        added = self._connection.execute(
+            # NULL never equals NULL in a primary key, so store it as ''
+            "INSERT OR IGNORE INTO author_identity VALUES (?, ?, ?)",
+            (identity[0], identity[1], birth_date or "")
+        )
+        return added.rowcount == 1
+
+    def add_work(self, key: str, author_keys: list):
+        self._connection.executemany(
+            "INSERT INTO work_author VALUES (?, ?)",
+            ((key, author_key) for author_key in author_keys)
+        )
+
+    def add_edition(self, isbn: str, work_keys: list, author_keys: list) -> bool:
+        """Record the edition's links; False if its ISBN was already added."""
+        added = self._connection.execute("INSERT OR IGNORE INTO edition VALUES (?)", (isbn,))
+        if added.rowcount != 1:
+            return False
+
+        self._connection.executemany(
+            "INSERT INTO edition_work VALUES (?, ?)",
+            ((isbn, work_key) for work_key in work_keys)
+        )
+        self._connection.executemany(
+            "INSERT INTO edition_author VALUES (?, ?)",
+            ((isbn, author_key) for author_key in author_keys)
+        )
+        return True
+
+    def book_authors(self):
+        """Yield (isbn, first_name, last_name, birth_date) for every resolvable edition author."""
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_work_author ON work_author (work_key)")
+        yield from self._connection.execute(
+            "SELECT DISTINCT link.isbn, a.first_name, a.last_name, a.birth_date "
+            "FROM ("
+            "  SELECT e.isbn, w.author_key FROM edition_work e "
+            "  JOIN work_author w ON w.work_key = e.work_key "
+            "  UNION "
+            "  SELECT isbn, author_key FROM edition_author"
+            ") link "
+            "JOIN author a ON a.key = link.author_key"
+        )
+
+    def close(self):
+        self._connection.close()
+
+
+## Conversion
+
+
+AUTHOR_COLUMNS = AUTHORS.columns
+BOOK_COLUMNS = BOOKS.columns
+BOOK_AUTHOR_COLUMNS = ("isbn", "author_first_name", "author_last_name", "author_birth_date")
+
+
+def _csv_writer(path: str, columns):
+    f = gzip.open(path, "wt", encoding="utf-8", newline="")
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    return f, writer
+
+
+def convert_dump(dump_path: str, output_dir: str, library_id: int, copies: int = 1) -> Counter:
+    """
+    Stream the dump into authors.csv.gz, books.csv.gz and
+    book_authors.csv.gz under `output_dir`, in data_processor's input
+    format. One dump line is held in memory at a time; everything kept
+    across lines lives in the on-disk key map. Returns per-type counters.
+    """
+    stats = Counter()
+    key_map = DumpKeyMap(os.path.join(output_dir, "keys.sqlite3"))
+
+    authors_file, authors = _csv_writer(os.path.join(output_dir, "authors.csv.gz"), AUTHOR_COLUMNS)
+    books_file, books = _csv_writer(os.path.join(output_dir, "books.csv.gz"), BOOK_COLUMNS)
+
+    try:
+        for record_type, key, record in read_dump(dump_path):
+            if record_type == "/type/author":
+                values = author_values(record)
+                if values is None:
+                    stats["authors_rejected"] += 1
+                elif key_map.add_author(key, values):
+                    authors.writerow([values[column] for column in AUTHOR_COLUMNS])
+                    stats["authors"] += 1
+                else:
+                    stats["authors_duplicate"] += 1
+
+            elif record_type == "/type/work":
+                key_map.add_work(key, _keys(record.get("authors"), "author"))
+                stats["works"] += 1
+
+            elif record_type == "/type/edition":
+                values = book_values(record, library_id, copies)
+                if values is None:
+                    stats["editions_rejected"] += 1
+                elif key_map.add_edition(values["isbn"], _keys(record.get("works")), _keys(record.get("authors"))):
+                    books.writerow([values[column] for column in BOOK_COLUMNS])
+                    stats["editions"] += 1
+                else:
+                    stats["editions_duplicate"] += 1
+
+            else:
+                stats["skipped"] += 1
+
+        authors_file.close()
+        books_file.close()
+
+        book_authors_file, book_authors = _csv_writer(
+            os.path.join(output_dir, "book_authors.csv.gz"), BOOK_AUTHOR_COLUMNS
+        )
+        with book_authors_file:
+            for row in key_map.book_authors():
+                book_authors.writerow(row)
+                stats["book_authors"] += 1
+    finally:
+        authors_file.close()
+        books_file.close()
+        key_map.close()
+
+    return stats
+
+
+## Loading
+
+
+DUMP_TABLE_FILES = (
+    (AUTHORS, "authors.csv.gz"),
+    (BOOKS, "books.csv.gz"),
+    (BOOK_AUTHORS, "book_authors.csv.gz")
+)
+
+
+def load_converted(output_dir: str, Session, options: Optional[IngestOptions] = None) -> RunMetrics:
+    """
+    Bulk-load the converted files with data_processor, in one
+    transaction. The converted files hold no duplicates, so stored keys
+    are left to the database rather than loaded into memory wherever it
+    can reject them itself.
+    """
+    options = replace(options or IngestOptions(), unique_index=False)
+    metrics = RunMetrics()
+
+    with session_scope(Session) as session:
+        resolver = ForeignKeyResolver(session)
+        for spec, file_name in DUMP_TABLE_FILES:
+            process_table(session, os.path.join(output_dir, file_name), spec, options, resolver, None, metrics)
+
+    return metrics
+
+
+## Entry Point
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Import authors and books from an OpenLibrary bulk dump."
+    )
+
+    parser.add_argument(
+        "dump",
+        help="Dump file (e.g. ol_dump_latest.txt.gz); gzipped or plain"
+    )
+
+    parser.add_argument(
+        "--db",
+        help="Database connection URL (not needed with --dry-run)"
+    )
+
+    parser.add_argument(
+        "--library-id",
+        type=int,
+        required=True,
+        help="Library the imported books are catalogued under"
+    )
+
+    parser.add_argument(
+        "--copies",
+        type=int,
+        default=1,
+        help="total_copies and available_copies of each imported book (default: 1)"
+    )
+
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Keep the converted CSV files and key map here instead of a temporary directory"
+    )
+
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows per multi-row INSERT (default: 1000)"
+    )
+
+    parser.add_argument(
+        "--loader",
+        default="orm",
+        choices=["orm", "copy"],
+        help="Write path: ORM inserts or PostgreSQL COPY into staging tables (default: orm)"
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Convert and validate the dump, report counts, and load nothing"
+    )
+
+    args = parser.parse_args()
+    if not args.dry_run and not args.db:
+        parser.error("--db is required unless --dry-run is given")
+
+    return args
+
+
+def main():
+    args = parse_arguments()
+
+    logging.basicConfig(
+        filename="openlibrary_dump.log",
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = args.work_dir or temp_dir
+        os.makedirs(output_dir, exist_ok=True)
+
+        logger.info(f"Converting {args.dump}...")
+        stats = convert_dump(args.dump, output_dir, args.library_id, args.copies)
+        logger.info(
+            f"Dump: {stats['authors']} authors ({stats['authors_rejected']} rejected, "
+            f"{stats['authors_duplicate']} duplicate), {stats['works']} works, "
+            f"{stats['editions']} editions ({stats['editions_rejected']} rejected, "
+            f"{stats['editions_duplicate']} duplicate), {stats['book_authors']} book-author links, "
+            f"{stats['skipped']} other records skipped."
+        )
+
+        if args.dry_run:
+            logger.info("Dry run: nothing loaded.")
+            return
+
+        Session = create_session_factory(args.db)
+        options = IngestOptions(batch_size=args.batch_size, loader=args.loader)
+        metrics = load_converted(output_dir, Session, options)
+        metrics.emit()
+
+
+if __name__ == "__main__":
+    main()
+
+
+## End
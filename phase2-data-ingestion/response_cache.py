@@ -0,0 +1,81 @@
+## Imports
+
+
+import time
+import sqlite3
+import threading
+from collections import Counter, namedtuple
+from typing import Optional
+
+
+## Response Cache
+
+
+CachedResponse = namedtuple(
+    "CachedResponse",
+    ["body", "etag", "last_modified", "fetched_at"]
+)
+
+
+class ResponseCache:
+    """
+    On-disk cache of JSON response bodies keyed by URL, kept in SQLite.
+    Entries younger than `ttl` seconds are served without a request;
+    older ones are revalidated with their ETag/Last-Modified validators
+    when the server sent any. A `ttl` of None never expires entries.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str = ".openlibrary_cache.sqlite3", ttl: Optional[float] = 86400):
+        self.path = path
+        self.ttl = ttl
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS response ("
+            "url TEXT PRIMARY KEY, "
+            "body TEXT NOT NULL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "fetched_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM response WHERE url = ?",
+                (url,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return self.ttl is None or time.time() - entry.fetched_at < self.ttl
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO response (url, body, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, time.time())
+            )
+            self._connection.commit()
+
+    def touch(self, url: str):
+        """Restart an entry's TTL after the server confirmed it is current."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE response SET fetched_at = ? WHERE url = ?",
+                (time.time(), url)
+            )
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+## End
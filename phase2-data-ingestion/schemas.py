@@ -1,25 +1,88 @@
 ## Imports
 
 
+import os
 import re
+import calendar
+from collections import Counter
 from datetime import datetime, date
+from decimal import Decimal
 from dateutil import parser
+from functools import lru_cache, wraps
 from typing import Optional
 
 import isbnlib
 import phonenumbers
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, ValidationInfo, field_validator
+
+
+## Normalizer Cache
+
+
+NORMALIZER_CACHE_SIZE = int(os.getenv("NORMALIZER_CACHE_SIZE", "65536"))
+
+_NORMALIZER_OUTCOMES = {}
+_NORMALIZER_CACHES = {}
+
+
+def memoized(func):
+    """
+    Wrap a normalizer in a bounded LRU cache. ValueErrors are cached as
+    well, so a repeated bad value is rejected without parsing it again.
+    Each process (including validation workers) keeps its own cache.
+    """
+    name = func.__name__
+
+    def outcome(value):
+        try:
+            return func(value), None
+        except ValueError as e:
+            return None, str(e)
+
+    _NORMALIZER_OUTCOMES[name] = outcome
+    _NORMALIZER_CACHES[name] = lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(outcome)
+
+    @wraps(func)
+    def wrapper(value):
+        result, error = _NORMALIZER_CACHES[name](value)
+        if error is not None:
+            raise ValueError(error)
+        return result
+
+    return wrapper
+
+
+def configure_normalizer_cache(maxsize: int):
+    """Resize every normalizer cache; a size of 0 disables caching."""
+    for name, outcome in _NORMALIZER_OUTCOMES.items():
+        _NORMALIZER_CACHES[name] = lru_cache(maxsize=maxsize)(outcome)
+
+
+# Hits and misses reported by validation worker processes, keyed (name, field)
+_WORKER_CACHE_STATS = Counter()
+
+
+def normalizer_cache_stats() -> dict:
+    stats = {}
+    for name, cache in _NORMALIZER_CACHES.items():
+        info = cache.cache_info()._asdict()
+        info["hits"] += _WORKER_CACHE_STATS[(name, "hits")]
+        info["misses"] += _WORKER_CACHE_STATS[(name, "misses")]
+        stats[name] = info
+    return stats
 
 
 ## Utility Functions
 
 
+@memoized
 def normalize_name(name: str) -> str:
     if not name:
         raise ValueError("Entry name cannot be empty")
     return " ".join(part.capitalize() for part in name.strip().split())
 
 
+@memoized
 def normalize_phone(phone: str) -> str:
     if not phone:
         raise ValueError("Phone Number cannot be empty")
@@ -42,22 +105,130 @@ def normalize_phone(phone: str) -> str:
             return f"+{digits}"
         raise ValueError("Invalid phone number")
 
-def normalize_date(date_str: str) -> date:
+## Date Parsing
+
+
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+MONTHS["sept"] = 9
+
+# Exact formats tried in order before falling back to fuzzy parsing.
+# Each entry is (name, compiled pattern, order of the captured fields).
+DATE_PATTERNS = (
+    ("iso", re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})"), "ymd"),
+    ("day/month/year", re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})"), "dmy"),
+    ("month day, year", re.compile(r"([A-Za-z]+)\.? (\d{1,2}),? (\d{4})"), "mdy"),
+    ("day month year", re.compile(r"(\d{1,2}) ([A-Za-z]+)\.?,? (\d{4})"), "dmy"),
+    ("month year", re.compile(r"([A-Za-z]+)\.?,? (\d{4})"), "my"),
+    ("year", re.compile(r"(\d{4})"), "y"),
+)
+
+# Hits per format name, plus "fuzzy" and "invalid" for the slow path
+DATE_PARSE_STATS = Counter()
+
+
+def _date_from_fields(fields: tuple, order: str) -> date:
+    parts = dict(zip(order, fields))
+
+    month = parts.get("m", "1")
+    if not month.isdigit():
+        month = MONTHS[month.lower()]
+
+    return date(int(parts["y"]), int(month), int(parts.get("d", 1)))
+
+
+def _parse_exact_date(text: str) -> Optional[date]:
+    for name, pattern, order in DATE_PATTERNS:
+        match = pattern.fullmatch(text)
+        if not match:
+            continue
+
+        try:
+            parsed = _date_from_fields(match.groups(), order)
+        except (KeyError, ValueError):
+            # Shape matched but the values did not, e.g. "2001-02-30"
+            return None
+
+        DATE_PARSE_STATS[name] += 1
+        return parsed
+
+    return None
+
+
+def _parse_fuzzy_date(text: str) -> date:
     try:
         parsed = parser.parse(
-            date_str,
+            text,
             fuzzy=True,
             default=datetime(9999, 1, 1)
         )
 
         if parsed.year == 9999:
-            raise ValueError("Publication date missing.")
+            raise ValueError("Date is missing a year.")
 
-        return parsed.date()
     except Exception:
-        raise ValueError("Invalid Publication date format")
+        DATE_PARSE_STATS["invalid"] += 1
+        raise ValueError("Invalid date format")
+
+    DATE_PARSE_STATS["fuzzy"] += 1
+    return parsed.date()
+
+
+def normalize_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value:
+        raise ValueError("Date cannot be empty")
+
+    text = str(value).strip()
+    return _parse_exact_date(text) or _parse_fuzzy_date(text)
+
+
+def normalize_optional_date(value) -> Optional[date]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return normalize_date(value)
+
+
+def exact_date(value) -> Optional[date]:
+    """Date in one of DATE_PATTERNS, or None; never guesses with the fuzzy parser."""
+    if value is None:
+        return None
+    return _parse_exact_date(str(value).strip())
+
+
+def date_parse_stats() -> dict:
+    return dict(DATE_PARSE_STATS)
+
 
+## Worker Counters
 
+
+def validation_counters() -> Counter:
+    """
+    Date format and normalizer cache counters of this process. A worker
+    sends the difference between two snapshots to the parent, which
+    adds it with merge_validation_counters().
+    """
+    counters = Counter({("date_formats", name): count for name, count in DATE_PARSE_STATS.items()})
+    for name, cache in _NORMALIZER_CACHES.items():
+        info = cache.cache_info()
+        counters[("normalizer_cache", name, "hits")] = info.hits
+        counters[("normalizer_cache", name, "misses")] = info.misses
+    return counters
+
+
+def merge_validation_counters(delta: Counter):
+    for key, count in delta.items():
+        if key[0] == "date_formats":
+            DATE_PARSE_STATS[key[1]] += count
+        else:
+            _WORKER_CACHE_STATS[key[1:]] += count
+
+
+@memoized
 def validate_isbn(isbn: str) -> str:
     if not isbn:
         raise ValueError("ISBN cannot be empty")
@@ -128,6 +299,11 @@ class AuthorSchema(BaseModel):
     def normalize_author_name(cls, v):
         return normalize_name(v)
 
+    @field_validator("birth_date", mode="before")
+    @classmethod
+    def validate_birth_date(cls, v):
+        return normalize_optional_date(v)
+
 
 class MemberSchema(BaseModel):
     member_id: Optional[int] = None
@@ -150,6 +326,12 @@ class MemberSchema(BaseModel):
     def validate_phone(cls, v):
         return normalize_phone(v)
 
+    # Validate registration date
+    @field_validator("registration_date", mode="before")
+    @classmethod
+    def validate_registration_date(cls, v):
+        return normalize_date(v)
+
     # Validate Member Type
     @field_validator("member_type")
     @classmethod
@@ -159,4 +341,120 @@ class MemberSchema(BaseModel):
         return v.capitalize()
 
 
+# Junction and history rows name their parents by natural key
+# (ISBN, member email, author name + birth date, category name);
+# the ingestion tool resolves those to IDs.
+
+
+class BookAuthorSchema(BaseModel):
+    isbn: str
+    author_first_name: str
+    author_last_name: str
+    author_birth_date: Optional[date] = None
+
+    @field_validator("isbn")
+    @classmethod
+    def validate_book_isbn(cls, v):
+        return validate_isbn(v)
+
+    @field_validator("author_first_name", "author_last_name")
+    @classmethod
+    def normalize_author_name(cls, v):
+        return normalize_name(v)
+
+    @field_validator("author_birth_date", mode="before")
+    @classmethod
+    def validate_birth_date(cls, v):
+        return normalize_optional_date(v)
+
+
+class BookCategorySchema(BaseModel):
+    isbn: str
+    category_name: str
+
+    @field_validator("isbn")
+    @classmethod
+    def validate_book_isbn(cls, v):
+        return validate_isbn(v)
+
+    @field_validator("category_name")
+    @classmethod
+    def validate_category_name(cls, v):
+        if not v.strip():
+            raise ValueError("Category name cannot be empty")
+        return v.strip()
+
+
+class BorrowingSchema(BaseModel):
+    member_email: EmailStr
+    isbn: str
+    borrow_date: date
+    due_date: date
+    return_date: Optional[date] = None
+    late_fee: Optional[Decimal] = None
+
+    @field_validator("isbn")
+    @classmethod
+    def validate_book_isbn(cls, v):
+        return validate_isbn(v)
+
+    @field_validator("borrow_date", "due_date", mode="before")
+    @classmethod
+    def validate_date(cls, v):
+        return normalize_date(v)
+
+    @field_validator("return_date", mode="before")
+    @classmethod
+    def validate_return_date(cls, v):
+        return normalize_optional_date(v)
+
+    @field_validator("late_fee", mode="before")
+    @classmethod
+    def blank_late_fee(cls, v):
+        if isinstance(v, str) and not v.strip():
+            return None
+        return v
+
+    @field_validator("late_fee")
+    @classmethod
+    def validate_late_fee(cls, v):
+        if v is not None and v < 0:
+            raise ValueError("late_fee cannot be negative")
+        return v
+
+    # Mirrors chk_borrow_dates
+    @field_validator("due_date")
+    @classmethod
+    def validate_due_date(cls, v, info: ValidationInfo):
+        borrow_date = info.data.get("borrow_date")
+        if borrow_date is not None and v < borrow_date:
+            raise ValueError("due_date cannot be before borrow_date")
+        return v
+
+
+class ReviewSchema(BaseModel):
+    member_email: EmailStr
+    isbn: str
+    rating: int
+    comment: Optional[str] = None
+    review_date: date
+
+    @field_validator("isbn")
+    @classmethod
+    def validate_book_isbn(cls, v):
+        return validate_isbn(v)
+
+    @field_validator("rating")
+    @classmethod
+    def validate_rating(cls, v):
+        if not 1 <= v <= 5:
+            raise ValueError("rating must be between 1 and 5")
+        return v
+
+    @field_validator("review_date", mode="before")
+    @classmethod
+    def validate_date(cls, v):
+        return normalize_date(v)
+
+
 ## End
\ No newline at end of file